@@ -0,0 +1,35 @@
+"""add agents token_hash
+
+Revision ID: 5f2a9c7d3e41
+Revises: c1bbde056886
+Create Date: 2026-10-15 09:12:44.318207
+"""
+
+from typing import Sequence, Union
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2a9c7d3e41"
+down_revision: Union[str, Sequence[str], None] = "c1bbde056886"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    op.execute("ALTER TABLE agents ADD COLUMN token_hash BYTEA NULL")
+
+    # Backfill hashes for existing agents (same digest as app.utils.token)
+    op.execute("UPDATE agents SET token_hash = sha256(convert_to(token, 'UTF8'))")
+    op.execute("ALTER TABLE agents ALTER COLUMN token_hash SET NOT NULL")
+
+    op.execute("CREATE INDEX idx_agents_token_hash ON agents(token_hash)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.execute("DROP INDEX IF EXISTS idx_agents_token_hash")
+    op.execute("ALTER TABLE agents DROP COLUMN IF EXISTS token_hash")
@@ -29,6 +29,11 @@ from app.utils.uuid import cast_uuid
 router = APIRouter()
 
 
+def get_agents_service(db: AsyncSession = Depends(get_db)) -> AgentsService:
+    """Agents service bound to the request's database session"""
+    return AgentsService(db)
+
+
 @router.get(
     "/agents",
     response_model=AgentsListResponse,
@@ -40,9 +45,8 @@ router = APIRouter()
         },
     },
 )
-async def get_agents(db: AsyncSession = Depends(get_db)):
+async def get_agents(agents_service: AgentsService = Depends(get_agents_service)):
     """Get list of all agents with their jobs"""
-    agents_service = AgentsService(db)
     agents = await agents_service.get_agents()
 
     if not agents:
@@ -102,7 +106,9 @@ async def get_agents(db: AsyncSession = Depends(get_db)):
     },
 )
 async def update_agent(
-    agent_id: str, agent: AgentUpdate, db: AsyncSession = Depends(get_db)
+    agent_id: str,
+    agent: AgentUpdate,
+    agents_service: AgentsService = Depends(get_agents_service),
 ):
     """
     Update an agent
@@ -112,8 +118,7 @@ async def update_agent(
         return create_error_response("400", "Bad Request", error_msg, 400)
 
     try:
-        agent_service = AgentsService(db)
-        agent_from_db = await agent_service.update_agent(agent_id, agent)
+        agent_from_db = await agents_service.update_agent(agent_id, agent)
 
         updated_agent = Agent(
             id=agent_from_db.id,
@@ -148,15 +153,16 @@ async def update_agent(
         404: {"model": DetailedNotFoundError, "description": "Agent not found"},
     },
 )
-async def get_agent(agent_id: str, db: AsyncSession = Depends(get_db)):
+async def get_agent(
+    agent_id: str, agents_service: AgentsService = Depends(get_agents_service)
+):
     """
     Get agent by id with jobs
     """
     if not cast_uuid(agent_id):
         return create_error_response("400", "Bad Request", "Invalid agent id", 400)
 
-    agent_service = AgentsService(db)
-    agent = await agent_service.get_agent_by_id(agent_id)
+    agent = await agents_service.get_agent_by_id(agent_id)
 
     if not agent:
         return create_error_response("404", "Not Found", "Agent not found", 404)
@@ -235,13 +241,14 @@ async def get_agent(agent_id: str, db: AsyncSession = Depends(get_db)):
         },
     },
 )
-async def create_agent(agent: AgentCreate, db: AsyncSession = Depends(get_db)):
+async def create_agent(
+    agent: AgentCreate, agents_service: AgentsService = Depends(get_agents_service)
+):
     """
     Create a new agent
     """
     try:
-        agent_service = AgentsService(db)
-        new_agent = await agent_service.create_agent(agent)
+        new_agent = await agents_service.create_agent(agent)
 
         response = Agent(
             id=new_agent.id,
@@ -274,7 +281,9 @@ async def create_agent(agent: AgentCreate, db: AsyncSession = Depends(get_db)):
         404: {"model": DetailedNotFoundError, "description": "Agent not found"},
     },
 )
-async def delete_agent(agent_id: str, db: AsyncSession = Depends(get_db)):
+async def delete_agent(
+    agent_id: str, agents_service: AgentsService = Depends(get_agents_service)
+):
     """
     Delete an agent
     """
@@ -282,8 +291,7 @@ async def delete_agent(agent_id: str, db: AsyncSession = Depends(get_db)):
         return create_error_response("400", "Bad Request", "Invalid agent id", 400)
 
     try:
-        agent_service = AgentsService(db)
-        await agent_service.delete_agent(agent_id)
+        await agents_service.delete_agent(agent_id)
 
         return create_success_response(
             "agents", str(agent_id), {"message": "Agent deleted"}
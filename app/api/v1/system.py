@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends
+from functools import lru_cache
+
+from fastapi import APIRouter, Depends, Response
 
 from app.core.response import create_success_response_list
 from app.schemas.response_models import DetailedInternalServerError, ToolsResponse
@@ -7,6 +9,13 @@ from app.services.tools.tool_manager import ToolManager
 router = APIRouter()
 
 
+@lru_cache(maxsize=1)
+def _tools_body() -> bytes:
+    """Serialized tools listing; the registered tools never change at runtime"""
+    tools = ToolManager().get_available_tools()
+    return create_success_response_list("tools", tools).body
+
+
 @router.get(
     "/tools",
     response_model=ToolsResponse,
@@ -22,7 +31,4 @@ async def get_tools():
     """
     Get list of all supported penetration testing tools
     """
-    manager = ToolManager()
-    tools = manager.get_available_tools()
-
-    return create_success_response_list("tools", tools)
+    return Response(content=_tools_body(), media_type="application/json")
@@ -1,5 +1,6 @@
 import logging
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
@@ -12,6 +13,11 @@ logger = logging.getLogger(__name__)
 Base = declarative_base()
 
 
+def _json_dumps(value) -> str:
+    """Serialize JSON/JSONB columns with orjson (the asyncpg codec expects str)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class Database:
     def __init__(self, settings: Settings):
         self.settings = settings
@@ -28,6 +34,8 @@ class Database:
                 echo=self.settings.debug,  # Log SQL queries in debug mode
                 pool_pre_ping=True,  # Verify connections before use
                 pool_recycle=300,  # Recycle connections every 5 min
+                json_serializer=_json_dumps,
+                json_deserializer=orjson.loads,
             )
 
             self.async_session_local = sessionmaker(
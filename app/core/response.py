@@ -1,6 +1,6 @@
 from typing import Dict, Generic, List, TypeVar, Union
 
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 # Generic type for data
@@ -31,7 +31,7 @@ class JSONAPIErrorResponse(BaseModel):
 
 def create_success_response(
     resource_type: str, resource_id: str, attributes: dict
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Create a success response for a single resource"""
 
     def serialize_value(value):
@@ -43,7 +43,7 @@ def create_success_response(
     # Serialize all attributes
     serialized_attributes = {k: serialize_value(v) for k, v in attributes.items()}
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "data": {
                 "type": resource_type,
@@ -57,7 +57,7 @@ def create_success_response(
 
 def create_success_response_list(
     resource_type: str, resources: List[dict]
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Create a success response for multiple resources"""
 
     def serialize_value(value):
@@ -105,12 +105,12 @@ def create_success_response_list(
 
             data.append(res)
 
-    return JSONResponse(content={"data": data}, media_type="application/json")
+    return ORJSONResponse(content={"data": data}, media_type="application/json")
 
 
 def create_error_response(
     status: str, title: str, detail: str | list[str], status_code: int = 400
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Create an error response conforming to JSON:API (array of errors)"""
     # Ensure detail is a list of strings
     if isinstance(detail, str):
@@ -120,7 +120,7 @@ def create_error_response(
         "errors": [{"status": status, "title": title, "detail": d} for d in detail]
     }
 
-    return JSONResponse(
+    return ORJSONResponse(
         content=response,
         media_type="application/json",
         status_code=status_code,
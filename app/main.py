@@ -4,7 +4,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1 import agents, health, jobs, reports, system, protected_agents
 from app.core.config import get_settings
@@ -52,6 +52,7 @@ app = FastAPI(
     title=settings.name,
     debug=settings.debug,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     description="Pentulz - Penetration Testing Orchestration Platform",
     version="0.1.0",
 )
@@ -108,7 +109,7 @@ async def generic_error_handler(_request: Request, exc: Exception):
     else:
         errors = [{"status": str(status_code), "title": title, "detail": str(exc)}]
 
-    return JSONResponse(status_code=status_code, content={"errors": errors})
+    return ORJSONResponse(status_code=status_code, content={"errors": errors})
 
 
 # Register handler for all exceptions
@@ -3,7 +3,15 @@ import enum
 import uuid
 from typing import List, Optional
 
-from sqlalchemy import DateTime, Index, PrimaryKeyConstraint, Text, Uuid, text
+from sqlalchemy import (
+    DateTime,
+    Index,
+    LargeBinary,
+    PrimaryKeyConstraint,
+    Text,
+    Uuid,
+    text,
+)
 from sqlalchemy.dialects.postgresql import ENUM, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -22,6 +30,7 @@ class Agents(Base):
         PrimaryKeyConstraint("id", name="agents_pkey"),
         Index("idx_agents_last_seen", "last_seen_at"),
         Index("idx_agents_platform", "platform"),
+        Index("idx_agents_token_hash", "token_hash"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -35,6 +44,7 @@ class Agents(Base):
     )
     available_tools: Mapped[dict] = mapped_column(JSONB)
     token: Mapped[str] = mapped_column(Text)
+    token_hash: Mapped[bytes] = mapped_column(LargeBinary)
     last_seen_at: Mapped[Optional[datetime.datetime]] = mapped_column(
         DateTime, server_default=text("CURRENT_TIMESTAMP")
     )
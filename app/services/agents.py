@@ -12,6 +12,7 @@ from app.core.exceptions import CreateError, DeleteError, UpdateError
 from app.models.agents import Agents
 from app.models.jobs import Jobs
 from app.schemas.agents import AgentCreate, AgentUpdate
+from app.utils.token import hash_token
 
 
 class AgentsService:
@@ -33,7 +34,9 @@ class AgentsService:
         return result.scalar_one_or_none()
 
     async def get_agent_by_token(self, token: str) -> Agents | None:
-        result = await self.db.execute(select(Agents).where(Agents.token == token))
+        result = await self.db.execute(
+            select(Agents).where(Agents.token_hash == hash_token(token))
+        )
         return result.scalar_one_or_none()
 
     async def get_agent_by_hostname(self, hostname: str) -> Optional[Agents]:
@@ -65,6 +68,7 @@ class AgentsService:
             platform=None,
             available_tools=[],
             token=token,
+            token_hash=hash_token(token),
         )
 
         try:
@@ -108,6 +112,7 @@ class AgentsService:
 
         if agent_update.token is not None:
             agent.token = agent_update.token
+            agent.token_hash = hash_token(agent_update.token)
         if agent_update.last_seen_at is not None:
             agent.last_seen_at = agent_update.last_seen_at.astimezone(
                 timezone.utc
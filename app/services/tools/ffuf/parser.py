@@ -194,7 +194,8 @@ class FFufParser(BaseParser):
                     agent_id=agent_id,
                     timestamp=datetime.now().isoformat(),
                 )
-        except:
+        except ValueError:
+            # Non-numeric status/length column
             pass
         return None
 
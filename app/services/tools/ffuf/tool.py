@@ -4,6 +4,75 @@ from typing import Any, Dict, List
 from app.services.tools.tool import ArgumentDefinition, BaseTool, CommandTemplate
 
 
+_ARG_WORDLIST = ArgumentDefinition(
+    name="wordlist",
+    type="string",
+    required=True,
+    description="Path to wordlist file",
+    placeholder="/usr/share/wordlists/dirb/common.txt",
+)
+_ARG_URL = ArgumentDefinition(
+    name="url",
+    type="string",
+    required=True,
+    description="Target URL to fuzz",
+    placeholder="https://example.com/FUZZ",
+)
+_ARG_MATCH_CODES = ArgumentDefinition(
+    name="match_codes",
+    type="string",
+    required=True,
+    description="HTTP status codes to match (comma-separated)",
+    placeholder="200,301,302",
+)
+_ARG_FILTER_SIZE = ArgumentDefinition(
+    name="filter_size",
+    type="number",
+    required=True,
+    description="Filter responses by size (bytes)",
+    placeholder="1234",
+)
+
+
+_COMMAND_TEMPLATES = (
+    CommandTemplate(
+        id="directory_fuzzing",
+        name="Directory Fuzzing",
+        base_command="ffuf",
+        arguments=["-w", "{wordlist}", "-u", "{url}"],
+        description="Directory/file fuzzing",
+        argument_definitions=[
+            _ARG_WORDLIST,
+            _ARG_URL,
+        ],
+    ),
+    CommandTemplate(
+        id="status_code_matching",
+        name="Status Code Matching",
+        base_command="ffuf",
+        arguments=["-w", "{wordlist}", "-u", "{url}", "-mc", "{match_codes}"],
+        description="Fuzzing with status code matching",
+        argument_definitions=[
+            _ARG_WORDLIST,
+            _ARG_URL,
+            _ARG_MATCH_CODES,
+        ],
+    ),
+    CommandTemplate(
+        id="size_filtering",
+        name="Size Filtering",
+        base_command="ffuf",
+        arguments=["-w", "{wordlist}", "-u", "{url}", "-fs", "{filter_size}"],
+        description="Fuzzing with response size filtering",
+        argument_definitions=[
+            _ARG_WORDLIST,
+            _ARG_URL,
+            _ARG_FILTER_SIZE,
+        ],
+    ),
+)
+
+
 class FFufTool(BaseTool):
     """FFuf tool implementation"""
 
@@ -34,91 +103,7 @@ class FFufTool(BaseTool):
 
     @property
     def command_templates(self) -> List[CommandTemplate]:
-        return [
-            CommandTemplate(
-                id="directory_fuzzing",
-                name="Directory Fuzzing",
-                base_command="ffuf",
-                arguments=["-w", "{wordlist}", "-u", "{url}"],
-                description="Directory/file fuzzing",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="wordlist",
-                        type="string",
-                        required=True,
-                        description="Path to wordlist file",
-                        placeholder="/usr/share/wordlists/dirb/common.txt",
-                    ),
-                    ArgumentDefinition(
-                        name="url",
-                        type="string",
-                        required=True,
-                        description="Target URL to fuzz",
-                        placeholder="https://example.com/FUZZ",
-                    ),
-                ],
-            ),
-            CommandTemplate(
-                id="status_code_matching",
-                name="Status Code Matching",
-                base_command="ffuf",
-                arguments=["-w", "{wordlist}", "-u", "{url}", "-mc", "{match_codes}"],
-                description="Fuzzing with status code matching",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="wordlist",
-                        type="string",
-                        required=True,
-                        description="Path to wordlist file",
-                        placeholder="/usr/share/wordlists/dirb/common.txt",
-                    ),
-                    ArgumentDefinition(
-                        name="url",
-                        type="string",
-                        required=True,
-                        description="Target URL to fuzz",
-                        placeholder="https://example.com/FUZZ",
-                    ),
-                    ArgumentDefinition(
-                        name="match_codes",
-                        type="string",
-                        required=True,
-                        description="HTTP status codes to match (comma-separated)",
-                        placeholder="200,301,302",
-                    ),
-                ],
-            ),
-            CommandTemplate(
-                id="size_filtering",
-                name="Size Filtering",
-                base_command="ffuf",
-                arguments=["-w", "{wordlist}", "-u", "{url}", "-fs", "{filter_size}"],
-                description="Fuzzing with response size filtering",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="wordlist",
-                        type="string",
-                        required=True,
-                        description="Path to wordlist file",
-                        placeholder="/usr/share/wordlists/dirb/common.txt",
-                    ),
-                    ArgumentDefinition(
-                        name="url",
-                        type="string",
-                        required=True,
-                        description="Target URL to fuzz",
-                        placeholder="https://example.com/FUZZ",
-                    ),
-                    ArgumentDefinition(
-                        name="filter_size",
-                        type="number",
-                        required=True,
-                        description="Filter responses by size (bytes)",
-                        placeholder="1234",
-                    ),
-                ],
-            ),
-        ]
+        return list(_COMMAND_TEMPLATES)
 
     def parse_results(
         self, raw_output: str, command_used: str, agent_id: str = None
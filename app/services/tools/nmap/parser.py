@@ -291,28 +291,26 @@ class NmapParser(BaseParser):
                         agent_id=agent_id,
                         timestamp=datetime.now().isoformat(),
                     )
-        except:
+        except ValueError:
+            # Port column without a single "port/protocol" pair
             pass
         return None
 
     def _parse_text_host_line(self, line: str, agent_id: str = None) -> Optional[Dict]:
         """Parse a host line from text output"""
-        try:
-            # Example: "Nmap scan report for example.com (192.168.1.1)"
-            if "Nmap scan report for" in line:
-                target = line.replace("Nmap scan report for", "").strip()
-
-                return self._create_finding(
-                    id="host_discovery",
-                    title="Host Discovery",
-                    description="Nmap discovered host",
-                    target=target,
-                    severity="info",
-                    agent_id=agent_id,
-                    timestamp=datetime.now().isoformat(),
-                )
-        except:
-            pass
+        # Example: "Nmap scan report for example.com (192.168.1.1)"
+        if "Nmap scan report for" in line:
+            target = line.replace("Nmap scan report for", "").strip()
+
+            return self._create_finding(
+                id="host_discovery",
+                title="Host Discovery",
+                description="Nmap discovered host",
+                target=target,
+                severity="info",
+                agent_id=agent_id,
+                timestamp=datetime.now().isoformat(),
+            )
         return None
 
 
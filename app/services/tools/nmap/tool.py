@@ -6,6 +6,102 @@ from app.services.tools.tool import ArgumentDefinition, BaseTool, CommandTemplat
 from app.services.tools.tool_manager import ToolManager
 
 
+_ARG_NETWORK_TARGET = ArgumentDefinition(
+    name="target",
+    type="string",
+    required=True,
+    description="Target host or network to scan",
+    placeholder="192.168.1.0/24",
+)
+_ARG_PORTS = ArgumentDefinition(
+    name="ports",
+    type="string",
+    required=True,
+    description="Ports to scan (single port, range, or comma-separated)",
+    placeholder="80,443,8080-8090",
+)
+_ARG_SERVICE_PORTS = ArgumentDefinition(
+    name="ports",
+    type="string",
+    required=True,
+    description="Ports to scan for service detection",
+    placeholder="80,443,22,21",
+)
+_ARG_TARGET = ArgumentDefinition(
+    name="target",
+    type="string",
+    required=True,
+    description="Target host to scan",
+    placeholder="192.168.1.1",
+)
+_ARG_OS_TARGET = ArgumentDefinition(
+    name="target",
+    type="string",
+    required=True,
+    description="Target host for OS detection",
+    placeholder="192.168.1.1",
+)
+_ARG_AGGRESSIVE_TARGET = ArgumentDefinition(
+    name="target",
+    type="string",
+    required=True,
+    description="Target host for aggressive scan",
+    placeholder="192.168.1.1",
+)
+
+
+_COMMAND_TEMPLATES = (
+    CommandTemplate(
+        id="list_scan",
+        name="List Scan",
+        base_command="nmap",
+        arguments=["-sL", "{target}"],
+        description="List scan - just list targets",
+        argument_definitions=[_ARG_NETWORK_TARGET],
+    ),
+    CommandTemplate(
+        id="tcp_connect_scan",
+        name="TCP Connect Scan",
+        base_command="nmap",
+        arguments=["-sT", "-p", "{ports}", "{target}"],
+        description="TCP connect scan on specific ports",
+        argument_definitions=[_ARG_PORTS, _ARG_TARGET],
+    ),
+    CommandTemplate(
+        id="tcp_syn_scan",
+        name="TCP SYN Scan",
+        base_command="nmap",
+        arguments=["-sS", "-p", "{ports}", "{target}"],
+        description="TCP SYN scan on specific ports",
+        argument_definitions=[_ARG_PORTS, _ARG_TARGET],
+    ),
+    CommandTemplate(
+        id="service_version_detection",
+        name="Service Version Detection",
+        base_command="nmap",
+        arguments=["-sV", "-p", "{ports}", "{target}"],
+        description="Service version detection",
+        argument_definitions=[_ARG_SERVICE_PORTS, _ARG_TARGET],
+    ),
+    CommandTemplate(
+        id="os_detection",
+        name="OS Detection",
+        base_command="nmap",
+        arguments=["-O", "{target}"],
+        description="OS detection",
+        argument_definitions=[_ARG_OS_TARGET],
+    ),
+    CommandTemplate(
+        id="aggressive_scan",
+        name="Aggressive Scan",
+        base_command="nmap",
+        arguments=["-A", "{target}"],
+        description="Aggressive scan",
+        argument_definitions=[_ARG_AGGRESSIVE_TARGET],
+    ),
+)
+
+
 class NmapTool(BaseTool):
     """Nmap tool implementation"""
 
@@ -36,125 +132,7 @@ class NmapTool(BaseTool):
 
     @property
     def command_templates(self) -> List[CommandTemplate]:
-        return [
-            CommandTemplate(
-                id="list_scan",
-                name="List Scan",
-                base_command="nmap",
-                arguments=["-sL", "{target}"],
-                description="List scan - just list targets",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="target",
-                        type="string",
-                        required=True,
-                        description="Target host or network to scan",
-                        placeholder="192.168.1.0/24",
-                    )
-                ],
-            ),
-            CommandTemplate(
-                id="tcp_connect_scan",
-                name="TCP Connect Scan",
-                base_command="nmap",
-                arguments=["-sT", "-p", "{ports}", "{target}"],
-                description="TCP connect scan on specific ports",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="ports",
-                        type="string",
-                        required=True,
-                        description="Ports to scan (single port, range, or comma-separated)",
-                        placeholder="80,443,8080-8090",
-                    ),
-                    ArgumentDefinition(
-                        name="target",
-                        type="string",
-                        required=True,
-                        description="Target host to scan",
-                        placeholder="192.168.1.1",
-                    ),
-                ],
-            ),
-            CommandTemplate(
-                id="tcp_syn_scan",
-                name="TCP SYN Scan",
-                base_command="nmap",
-                arguments=["-sS", "-p", "{ports}", "{target}"],
-                description="TCP SYN scan on specific ports",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="ports",
-                        type="string",
-                        required=True,
-                        description="Ports to scan (single port, range, or comma-separated)",
-                        placeholder="80,443,8080-8090",
-                    ),
-                    ArgumentDefinition(
-                        name="target",
-                        type="string",
-                        required=True,
-                        description="Target host to scan",
-                        placeholder="192.168.1.1",
-                    ),
-                ],
-            ),
-            CommandTemplate(
-                id="service_version_detection",
-                name="Service Version Detection",
-                base_command="nmap",
-                arguments=["-sV", "-p", "{ports}", "{target}"],
-                description="Service version detection",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="ports",
-                        type="string",
-                        required=True,
-                        description="Ports to scan for service detection",
-                        placeholder="80,443,22,21",
-                    ),
-                    ArgumentDefinition(
-                        name="target",
-                        type="string",
-                        required=True,
-                        description="Target host to scan",
-                        placeholder="192.168.1.1",
-                    ),
-                ],
-            ),
-            CommandTemplate(
-                id="os_detection",
-                name="OS Detection",
-                base_command="nmap",
-                arguments=["-O", "{target}"],
-                description="OS detection",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="target",
-                        type="string",
-                        required=True,
-                        description="Target host for OS detection",
-                        placeholder="192.168.1.1",
-                    )
-                ],
-            ),
-            CommandTemplate(
-                id="aggressive_scan",
-                name="Aggressive Scan",
-                base_command="nmap",
-                arguments=["-A", "{target}"],
-                description="Aggressive scan",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="target",
-                        type="string",
-                        required=True,
-                        description="Target host for aggressive scan",
-                        placeholder="192.168.1.1",
-                    )
-                ],
-            ),
-        ]
+        return list(_COMMAND_TEMPLATES)
 
     def parse_results(
         self, raw_output: str, command_used: str, agent_id: str = None
@@ -1,11 +1,15 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Any, Dict, List, Literal, Union
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
 
-@dataclass
+@dataclass(frozen=True)
 class ArgumentDefinition:
-    """Definition of a command argument"""
+    """Definition of a command argument
+
+    Frozen, so tool modules define each one once and share it across templates
+    """
 
     name: str
     type: Literal["string", "number", "boolean"]
@@ -15,20 +19,69 @@ class ArgumentDefinition:
     placeholder: str = ""
 
 
-@dataclass
+@dataclass(frozen=True)
 class CommandTemplate:
-    """Template for building tool commands"""
+    """Template for building tool commands
+
+    Frozen and caches its parsed arguments, so tool modules build their
+    templates once at import time
+    """
 
     id: str  # Unique identifier like "scan_port", "directory_fuzzing"
     name: str  # Human readable name like "Scan Port", "Directory Fuzzing"
     base_command: str
     arguments: List[str]
     description: str
-    argument_definitions: List[ArgumentDefinition] = None
+    argument_definitions: List[ArgumentDefinition] = field(default_factory=list)
 
-    def __post_init__(self):
-        if self.argument_definitions is None:
-            self.argument_definitions = []
+    @cached_property
+    def argument_parts(self) -> Tuple[Tuple[str, Optional[str], str], ...]:
+        """
+        Each argument split once into (prefix, placeholder, suffix), e.g.
+        "duration:{duration}" -> ("duration:", "duration", ""). Fixed
+        arguments have no placeholder: ("-i", None, "")
+        """
+        parts = []
+        for arg in self.arguments:
+            start, end = arg.find("{"), arg.find("}")
+            if start == -1 or end == -1:
+                parts.append((arg, None, ""))
+            else:
+                parts.append((arg[:start], arg[start + 1 : end], arg[end + 1 :]))
+        return tuple(parts)
+
+    @cached_property
+    def default_values(self) -> Dict[str, str]:
+        """Default value of each argument that has one, as a string"""
+        defaults = {}
+        for arg_def in self.argument_definitions:
+            if arg_def.default_value is not None:
+                defaults.setdefault(arg_def.name, str(arg_def.default_value))
+        return defaults
+
+    def render(self, values: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Fill the placeholders from values, falling back to argument defaults.
+        Returns None if a placeholder has neither
+        """
+        defaults = self.default_values
+        command_args = []
+        for prefix, placeholder, suffix in self.argument_parts:
+            if placeholder is None:
+                command_args.append(prefix)
+                continue
+
+            if placeholder in values:
+                value = values[placeholder]
+            elif placeholder in defaults:
+                value = defaults[placeholder]
+            else:
+                return None  # Missing required argument
+
+            if prefix or suffix:
+                value = f"{prefix}{value}{suffix}"
+            command_args.append(value)
+        return command_args
 
 
 class BaseTool(ABC):
@@ -101,27 +154,27 @@ class BaseTool(ABC):
         # Check if command matches any template structure
         for template in self.command_templates:
             if len(command_args) == len(template.arguments):
-                # Check fixed arguments
                 matches = True
-                for arg, template_arg in zip(command_args, template.arguments):
-                    if template_arg.startswith("{") and template_arg.endswith("}"):
-                        # This is a placeholder, validate the value
-                        placeholder_name = template_arg[1:-1]
-                        if not self._validate_placeholder(arg, placeholder_name):
-                            matches = False
-                            break
-                    elif "{" in template_arg and "}" in template_arg:
-                        # This is a placeholder with prefix/suffix like "duration:{duration}"
-                        placeholder_name = template_arg[
-                            template_arg.find("{") + 1 : template_arg.find("}")
-                        ]
-                        if not self._validate_template_with_placeholder(
-                            arg, template_arg, placeholder_name
-                        ):
+                for arg, (prefix, placeholder, suffix) in zip(
+                    command_args, template.argument_parts
+                ):
+                    if placeholder is None:
+                        # Fixed argument must match exactly
+                        if arg != prefix:
                             matches = False
                             break
-                    elif arg != template_arg:
-                        # Fixed argument must match exactly
+                        continue
+
+                    # Placeholder, possibly with prefix/suffix like "duration:{duration}"
+                    if (
+                        len(arg) < len(prefix) + len(suffix)
+                        or not arg.startswith(prefix)
+                        or not arg.endswith(suffix)
+                    ):
+                        matches = False
+                        break
+                    value = arg[len(prefix) : len(arg) - len(suffix)]
+                    if not self._validate_placeholder(value, placeholder):
                         matches = False
                         break
                 if matches:
@@ -134,15 +187,6 @@ class BaseTool(ABC):
             return False
         return True
 
-    def _validate_template_with_placeholder(
-        self, value: str, _template_arg: str, _placeholder_name: str
-    ) -> bool:
-        """Validate template arguments with embedded placeholders - to be overridden by specific tools"""
-        # Default implementation for simple cases
-        if not value or not value.strip():
-            return False
-        return True
-
     def validate_and_prepare_command(
         self, command_args: List[str]
     ) -> tuple[bool, List[str]]:
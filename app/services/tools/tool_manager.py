@@ -1,6 +1,6 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from app.services.tools.tool import BaseTool
+from app.services.tools.tool import BaseTool, CommandTemplate
 
 
 class ToolManager:
@@ -9,6 +9,12 @@ class ToolManager:
     def __init__(self):
         self.tools: Dict[str, BaseTool] = {}
         self._register_default_tools()
+        # Templates are frozen, so index them once by (tool, variant id)
+        self._templates: Dict[Tuple[str, str], CommandTemplate] = {
+            (name, template.id): template
+            for name, tool in self.tools.items()
+            for template in tool.command_templates
+        }
 
     def _register_default_tools(self):
         """Register default tools"""
@@ -47,7 +53,7 @@ class ToolManager:
                                 "id": cmd.id,
                                 "name": cmd.name,
                                 "description": cmd.description,
-                                "arguments": cmd.arguments,
+                                "arguments": list(cmd.arguments),
                                 "argument_definitions": (
                                     [
                                         {
@@ -75,112 +81,40 @@ class ToolManager:
         self, tool_name: str, variant_id: str
     ) -> Optional[Dict[str, Any]]:
         """Get a specific variant by ID for a tool"""
-        tool = self.tools.get(tool_name)
-        if not tool:
+        template = self._templates.get((tool_name, variant_id))
+        if not template:
             return None
 
-        for template in tool.command_templates:
-            if template.id == variant_id:
-                return {
-                    "id": template.id,
-                    "name": template.name,
-                    "description": template.description,
-                    "arguments": template.arguments,
-                    "argument_definitions": (
-                        [
-                            {
-                                "name": arg.name,
-                                "type": arg.type,
-                                "required": arg.required,
-                                "description": arg.description,
-                                "default_value": arg.default_value,
-                                "placeholder": arg.placeholder,
-                            }
-                            for arg in template.argument_definitions
-                        ]
-                        if template.argument_definitions
-                        else []
-                    ),
-                }
-        return None
+        return {
+            "id": template.id,
+            "name": template.name,
+            "description": template.description,
+            "arguments": list(template.arguments),
+            "argument_definitions": (
+                [
+                    {
+                        "name": arg.name,
+                        "type": arg.type,
+                        "required": arg.required,
+                        "description": arg.description,
+                        "default_value": arg.default_value,
+                        "placeholder": arg.placeholder,
+                    }
+                    for arg in template.argument_definitions
+                ]
+                if template.argument_definitions
+                else []
+            ),
+        }
 
     def build_command_from_variant(
         self, tool_name: str, variant_id: str, custom_args: Dict[str, str]
     ) -> Optional[List[str]]:
         """Build a command from a variant with custom arguments"""
-        variant = self.get_tool_variant(tool_name, variant_id)
-        if not variant:
+        template = self._templates.get((tool_name, variant_id))
+        if not template:
             return None
-
-        tool = self.tools.get(tool_name)
-        if not tool:
-            return None
-
-        # Find the actual template object
-        cmd_template = None
-        for t in tool.command_templates:
-            if t.id == variant_id:
-                cmd_template = t
-                break
-
-        if not cmd_template:
-            return None
-
-        # Build command by replacing placeholders
-        command_args = []
-        for arg in cmd_template.arguments:
-            if arg.startswith("{") and arg.endswith("}"):
-                # This is a placeholder
-                placeholder_name = arg[1:-1]
-                if placeholder_name in custom_args:
-                    command_args.append(custom_args[placeholder_name])
-                else:
-                    # Check if there's a default value
-                    arg_def = next(
-                        (
-                            a
-                            for a in cmd_template.argument_definitions
-                            if a.name == placeholder_name
-                        ),
-                        None,
-                    )
-                    if arg_def and arg_def.default_value is not None:
-                        command_args.append(str(arg_def.default_value))
-                    else:
-                        return None  # Missing required argument
-            elif "{" in arg and "}" in arg:
-                # This is a placeholder with prefix/suffix like "duration:{duration}"
-                placeholder_name = arg[arg.find("{") + 1 : arg.find("}")]
-                if placeholder_name in custom_args:
-                    command_args.append(
-                        arg.replace(
-                            f"{{{placeholder_name}}}",
-                            str(custom_args[placeholder_name]),
-                        )
-                    )
-                else:
-                    # Check if there's a default value
-                    arg_def = next(
-                        (
-                            a
-                            for a in cmd_template.argument_definitions
-                            if a.name == placeholder_name
-                        ),
-                        None,
-                    )
-                    if arg_def and arg_def.default_value is not None:
-                        command_args.append(
-                            arg.replace(
-                                f"{{{placeholder_name}}}", str(arg_def.default_value)
-                            )
-                        )
-                    else:
-                        return None  # Missing required argument
-            else:
-                # Fixed argument
-                command_args.append(arg)
-
-        return command_args
+        return template.render(custom_args)
 
     def validate_command(self, tool_name: str, command_args: List[str]) -> bool:
         """Validate if command is allowed for this tool"""
@@ -20,14 +20,20 @@ class BaseParser(ABC):
 
     def _create_finding(self, **kwargs) -> Dict:
         """Helper to create standardized finding"""
+        # Fallbacks are only computed when missing: this runs once per packet
+        # for tshark, which always passes its own id and timestamp
         return {
-            "id": kwargs.get("id", f"finding_{hash(str(kwargs))}"),
+            "id": kwargs["id"] if "id" in kwargs else f"finding_{hash(str(kwargs))}",
             "severity": kwargs.get("severity", "info"),
             "title": kwargs.get("title", "Unknown Finding"),
             "description": kwargs.get("description", ""),
             "target": kwargs.get("target", ""),
             "agent_id": kwargs.get("agent_id", "unknown"),
-            "timestamp": kwargs.get("timestamp", datetime.now().isoformat()),
+            "timestamp": (
+                kwargs["timestamp"]
+                if "timestamp" in kwargs
+                else datetime.now().isoformat()
+            ),
         }
 
     def _count_by_severity(self, findings: List[Dict]) -> Dict:
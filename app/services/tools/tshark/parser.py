@@ -1,48 +1,167 @@
-import json
-from typing import Dict, Optional
+import io
+import itertools
+from types import MappingProxyType
+from typing import IO, Dict, Iterable, Iterator, Optional, Union
+
+import orjson
 
 from app.services.tools.tool_parser import BaseParser
 
+# Shared read-only stand-in for an absent layer, so lookups don't allocate a dict
+_NO_LAYER = MappingProxyType({})
+
+# Fields read by the packet parsers, in ``-T json`` (dotted) notation
+PARSED_FIELDS = (
+    "frame.number",
+    "frame.time_epoch",
+    "frame.protocols",
+    "frame.len",
+    "arp.src.proto_ipv4",
+    "arp.dst.proto_ipv4",
+    "arp.opcode",
+    "ip.src",
+    "ip.dst",
+    "tcp.srcport",
+    "tcp.dstport",
+    "udp.srcport",
+    "udp.dstport",
+    "http.request.method",
+    "http.request.uri",
+    "http.host",
+    "http.response.code",
+    "dns.qry.name",
+    "dns.qry.type",
+    "icmp.type",
+)
+
+
+def _ek_field_names(fields: Iterable[str]) -> Dict[str, str]:
+    """Map ``-T ek`` field names back to their dotted ``-T json`` names
+
+    ek replaces dots with underscores and prefixes fields nested in a protocol
+    layer with the layer name (``ip_ip_src``); ``-e`` fields are not prefixed
+    (``ip_src``).
+    """
+    names = {}
+    for field in fields:
+        flat = field.replace(".", "_")
+        names[flat] = field
+        names[f"{field.split('.', 1)[0]}_{flat}"] = field
+    return names
+
+
+_EK_FIELD_NAMES = _ek_field_names(PARSED_FIELDS)
+
+# Common service ports for identification
+SERVICE_PORTS = {
+    22: "SSH",
+    80: "HTTP",
+    443: "HTTPS",
+    53: "DNS",
+    21: "FTP",
+    25: "SMTP",
+    110: "POP3",
+    143: "IMAP",
+    3306: "MySQL",
+    5432: "PostgreSQL",
+    1433: "MSSQL",
+    445: "SMB",
+    139: "NetBIOS",
+    3389: "RDP",
+}
+
+# Simple ICMP type identification
+ICMP_TYPES = {
+    "0": "Echo Reply",
+    "3": "Destination Unreachable",
+    "8": "Echo Request (Ping)",
+    "11": "Time Exceeded",
+}
+
 
 class TsharkParser(BaseParser):
     """Parser for tshark JSON output"""
 
-    def __init__(self):
-        # Common service ports for identification
-        self.service_ports = {
-            22: "SSH",
-            80: "HTTP",
-            443: "HTTPS",
-            53: "DNS",
-            21: "FTP",
-            25: "SMTP",
-            110: "POP3",
-            143: "IMAP",
-            3306: "MySQL",
-            5432: "PostgreSQL",
-            1433: "MSSQL",
-            445: "SMB",
-            139: "NetBIOS",
-            3389: "RDP",
-        }
-
     def parse_single_result(
-        self, raw_output: str, command_used: str, agent_id: str = None
+        self, raw_output: Union[str, bytes], command_used: str, agent_id: str = None
     ) -> Dict:
-        """Parse tshark JSON output into standardized findings"""
+        """Parse tshark JSON (``-T json``) or NDJSON (``-T ek``) output into standardized findings"""
+        if raw_output.lstrip()[:1] not in ("[", b"["):
+            stream = (
+                io.BytesIO(raw_output)
+                if isinstance(raw_output, bytes)
+                else io.StringIO(raw_output)
+            )
+            return self.parse_stream(stream, command_used, agent_id)
+
+        try:
+            packets = orjson.loads(raw_output)
+        except orjson.JSONDecodeError:
+            return self._invalid_output()
+
+        return self._parse_packets(packets, agent_id)
+
+    def parse_stream(self, stream: IO, command_used: str, agent_id: str = None) -> Dict:
+        """
+        Parse tshark ``-T ek`` output line by line from a text or binary stream,
+        so only one packet is decoded in memory at a time
+        """
+        lines = (line for line in stream if line.strip())
         try:
-            packets = json.loads(raw_output)
-        except json.JSONDecodeError:
-            return {"findings": [], "statistics": {"error": "Invalid JSON format"}}
+            first_document = orjson.loads(next(lines))
+        except (StopIteration, orjson.JSONDecodeError):
+            return self._invalid_output()
+
+        documents = itertools.chain([first_document], self._decode_lines(lines))
+        packets = (
+            {"_source": {"layers": self._normalize_ek_layers(document["layers"])}}
+            for document in documents
+            # Bulk-index header lines carry no packet data; malformed layers are skipped
+            if isinstance(document, dict) and isinstance(document.get("layers"), dict)
+        )
+        return self._parse_packets(packets, agent_id)
 
+    def _decode_lines(self, lines: Iterable) -> Iterator:
+        for line in lines:
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # Skip truncated or garbage lines
+                continue
+
+    def _normalize_ek_layers(self, layers: Dict) -> Dict:
+        """Rename ek fields to dotted names and group ``-e`` fields by protocol"""
+        normalized = {}
+        for key, value in layers.items():
+            if isinstance(value, dict):
+                normalized[key] = {
+                    _EK_FIELD_NAMES.get(k, k): v for k, v in value.items()
+                }
+                continue
+
+            # Flat ``-e`` field, always a list of values
+            field = _EK_FIELD_NAMES.get(key, key)
+            if isinstance(value, list):
+                value = value[0] if value else None
+            normalized.setdefault(field.split(".", 1)[0], {})[field] = value
+        return normalized
+
+    def _invalid_output(self) -> Dict:
+        return {"findings": [], "statistics": {"error": "Invalid JSON format"}}
+
+    def _parse_packets(self, packets: Iterable[Dict], agent_id: str = None) -> Dict:
+        """Turn decoded packets into findings and protocol statistics"""
         findings = []
         protocols_seen = {}
+        packets_analyzed = 0
 
         for packet in packets:
+            packets_analyzed += 1
             try:
                 layers = packet["_source"]["layers"]
-                frame_num = layers["frame"]["frame.number"]
-                timestamp = layers["frame"]["frame.time_epoch"]
+                frame = layers["frame"]
+                frame_num = frame["frame.number"]
+                timestamp = frame["frame.time_epoch"]
 
                 # Parse different protocol types
                 finding = None
@@ -90,14 +209,14 @@ class TsharkParser(BaseParser):
                 if finding:
                     findings.append(finding)
 
-            except Exception:
-                # Skip malformed packets
+            except (KeyError, TypeError, ValueError, AttributeError):
+                # Skip malformed packets (missing layers/fields, bad port numbers)
                 continue
 
         return {
             "findings": findings,
             "statistics": {
-                "packets_analyzed": len(packets),
+                "packets_analyzed": packets_analyzed,
                 "protocols_seen": protocols_seen,
             },
         }
@@ -140,7 +259,7 @@ class TsharkParser(BaseParser):
         if not all([src_ip, dst_ip, src_port, dst_port]):
             return None
 
-        service = self.service_ports.get(int(dst_port), f"Port {dst_port}")
+        service = SERVICE_PORTS.get(int(dst_port), f"Port {dst_port}")
 
         return self._create_finding(
             id=f"tcp_{frame_num}",
@@ -166,7 +285,7 @@ class TsharkParser(BaseParser):
         if not all([src_ip, dst_ip, src_port, dst_port]):
             return None
 
-        service = self.service_ports.get(int(dst_port), f"Port {dst_port}")
+        service = SERVICE_PORTS.get(int(dst_port), f"Port {dst_port}")
 
         return self._create_finding(
             id=f"udp_{frame_num}",
@@ -182,7 +301,7 @@ class TsharkParser(BaseParser):
     ) -> Optional[Dict]:
         """Parse HTTP packet"""
         http = layers["http"]
-        ip = layers.get("ip", {})
+        ip = layers.get("ip", _NO_LAYER)
 
         method = http.get("http.request.method")
         uri = http.get("http.request.uri")
@@ -249,7 +368,7 @@ class TsharkParser(BaseParser):
     ) -> Optional[Dict]:
         """Parse ICMP packet"""
         icmp = layers["icmp"]
-        ip = layers.get("ip", {})
+        ip = layers.get("ip", _NO_LAYER)
 
         src_ip = ip.get("ip.src")
         dst_ip = ip.get("ip.dst")
@@ -258,15 +377,7 @@ class TsharkParser(BaseParser):
         if not src_ip or not dst_ip:
             return None
 
-        # Simple ICMP type identification
-        icmp_types = {
-            "0": "Echo Reply",
-            "3": "Destination Unreachable",
-            "8": "Echo Request (Ping)",
-            "11": "Time Exceeded",
-        }
-
-        icmp_name = icmp_types.get(icmp_type, f"Type {icmp_type}")
+        icmp_name = ICMP_TYPES.get(icmp_type, f"Type {icmp_type}")
 
         return self._create_finding(
             id=f"icmp_{frame_num}",
@@ -281,12 +392,12 @@ class TsharkParser(BaseParser):
         self, layers: Dict, frame_num: str, timestamp: str, agent_id: str = None
     ) -> Optional[Dict]:
         """Parse generic packet when specific protocol parser not available"""
-        frame = layers.get("frame", {})
+        frame = layers["frame"]
         protocols = frame.get("frame.protocols", "unknown")
         packet_size = frame.get("frame.len", "0")
 
         # Try to extract basic IP info if available
-        ip = layers.get("ip", {})
+        ip = layers.get("ip", _NO_LAYER)
         src_ip = ip.get("ip.src")
         dst_ip = ip.get("ip.dst")
 
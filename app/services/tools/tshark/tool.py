@@ -1,7 +1,129 @@
 import re
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import IO, Any, Dict, List
 
 from app.services.tools.tool import ArgumentDefinition, BaseTool, CommandTemplate
+from app.services.tools.tshark.parser import PARSED_FIELDS, TsharkParser
+
+
+@lru_cache(maxsize=1)
+def _parser():
+    """Shared TsharkParser, built on first use"""
+    return TsharkParser()
+
+
+# Only export the fields the parser reads, not the full dissector tree
+_EXPORT_ARGUMENTS = ("-T", "ek") + tuple(
+    argument for field in PARSED_FIELDS for argument in ("-e", field)
+)
+
+
+_ARG_INTERFACE = ArgumentDefinition(
+    name="interface",
+    type="string",
+    required=True,
+    description="Network interface to capture from",
+    placeholder="eth0",
+)
+_ARG_COUNT = ArgumentDefinition(
+    name="count",
+    type="number",
+    required=True,
+    description="Number of packets to capture",
+    placeholder="100",
+)
+_ARG_CAPTURE_DURATION = ArgumentDefinition(
+    name="duration",
+    type="number",
+    required=True,
+    description="Duration of capture in seconds",
+    placeholder="60",
+)
+_ARG_PCAP_FILE = ArgumentDefinition(
+    name="pcap_file",
+    type="string",
+    required=True,
+    description="Path to PCAP file to analyze",
+    placeholder="capture.pcap",
+)
+_ARG_PCAP_DURATION = ArgumentDefinition(
+    name="duration",
+    type="number",
+    required=True,
+    description="Duration to analyze from start in seconds",
+    placeholder="300",
+)
+_ARG_FILTER = ArgumentDefinition(
+    name="filter",
+    type="string",
+    required=True,
+    description="BPF filter expression",
+    placeholder="tcp.port == 80",
+)
+
+
+_COMMAND_TEMPLATES = (
+    CommandTemplate(
+        id="live_capture_with_count",
+        name="Live Capture with Count",
+        base_command="tshark",
+        arguments=[
+            "-i",
+            "{interface}",
+            "-c",
+            "{count}",
+            "-a",
+            "duration:{duration}",
+        ],
+        description="Live capture with duration limit",
+        argument_definitions=[
+            _ARG_INTERFACE,
+            _ARG_COUNT,
+            _ARG_CAPTURE_DURATION,
+        ],
+    ),
+    CommandTemplate(
+        id="pcap_duration_filter",
+        name="PCAP Duration Filter",
+        base_command="tshark",
+        arguments=["-r", "{pcap_file}", "-a", "duration:{duration}"],
+        description="Read PCAP file with duration filter",
+        argument_definitions=[
+            _ARG_PCAP_FILE,
+            _ARG_PCAP_DURATION,
+        ],
+    ),
+    CommandTemplate(
+        id="pcap_filter_duration",
+        name="PCAP Filter with Duration",
+        base_command="tshark",
+        arguments=[
+            "-r",
+            "{pcap_file}",
+            "-Y",
+            "{filter}",
+            "-a",
+            "duration:{duration}",
+        ],
+        description="Read PCAP with filter and duration limit",
+        argument_definitions=[
+            _ARG_PCAP_FILE,
+            _ARG_FILTER,
+            _ARG_PCAP_DURATION,
+        ],
+    ),
+    CommandTemplate(
+        id="live_capture_duration_only",
+        name="Live Capture Duration Only",
+        base_command="tshark",
+        arguments=["-i", "{interface}", "-a", "duration:{duration}"],
+        description="Live capture with duration limit only",
+        argument_definitions=[
+            _ARG_INTERFACE,
+            _ARG_CAPTURE_DURATION,
+        ],
+    ),
+)
 
 
 class TsharkTool(BaseTool):
@@ -25,146 +147,28 @@ class TsharkTool(BaseTool):
 
     @property
     def export_format(self) -> str:
-        return "json"
+        return "ndjson"
 
     @property
     def export_arguments(self) -> List[str]:
-        return ["-T", "json"]
+        """Newline-delimited JSON, one packet per line, parsed line by line"""
+        return list(_EXPORT_ARGUMENTS)
 
     @property
     def command_templates(self) -> List[CommandTemplate]:
-        return [
-            CommandTemplate(
-                id="live_capture_with_count",
-                name="Live Capture with Count",
-                base_command="tshark",
-                arguments=[
-                    "-i",
-                    "{interface}",
-                    "-c",
-                    "{count}",
-                    "-a",
-                    "duration:{duration}",
-                ],
-                description="Live capture with duration limit",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="interface",
-                        type="string",
-                        required=True,
-                        description="Network interface to capture from",
-                        placeholder="eth0",
-                    ),
-                    ArgumentDefinition(
-                        name="count",
-                        type="number",
-                        required=True,
-                        description="Number of packets to capture",
-                        placeholder="100",
-                    ),
-                    ArgumentDefinition(
-                        name="duration",
-                        type="number",
-                        required=True,
-                        description="Duration of capture in seconds",
-                        placeholder="60",
-                    ),
-                ],
-            ),
-            CommandTemplate(
-                id="pcap_duration_filter",
-                name="PCAP Duration Filter",
-                base_command="tshark",
-                arguments=["-r", "{pcap_file}", "-a", "duration:{duration}"],
-                description="Read PCAP file with duration filter",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="pcap_file",
-                        type="string",
-                        required=True,
-                        description="Path to PCAP file to analyze",
-                        placeholder="capture.pcap",
-                    ),
-                    ArgumentDefinition(
-                        name="duration",
-                        type="number",
-                        required=True,
-                        description="Duration to analyze from start in seconds",
-                        placeholder="300",
-                    ),
-                ],
-            ),
-            CommandTemplate(
-                id="pcap_filter_duration",
-                name="PCAP Filter with Duration",
-                base_command="tshark",
-                arguments=[
-                    "-r",
-                    "{pcap_file}",
-                    "-Y",
-                    "{filter}",
-                    "-a",
-                    "duration:{duration}",
-                ],
-                description="Read PCAP with filter and duration limit",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="pcap_file",
-                        type="string",
-                        required=True,
-                        description="Path to PCAP file to analyze",
-                        placeholder="capture.pcap",
-                    ),
-                    ArgumentDefinition(
-                        name="filter",
-                        type="string",
-                        required=True,
-                        description="BPF filter expression",
-                        placeholder="tcp.port == 80",
-                    ),
-                    ArgumentDefinition(
-                        name="duration",
-                        type="number",
-                        required=True,
-                        description="Duration to analyze from start in seconds",
-                        placeholder="300",
-                    ),
-                ],
-            ),
-            CommandTemplate(
-                id="live_capture_duration_only",
-                name="Live Capture Duration Only",
-                base_command="tshark",
-                arguments=["-i", "{interface}", "-a", "duration:{duration}"],
-                description="Live capture with duration limit only",
-                argument_definitions=[
-                    ArgumentDefinition(
-                        name="interface",
-                        type="string",
-                        required=True,
-                        description="Network interface to capture from",
-                        placeholder="eth0",
-                    ),
-                    ArgumentDefinition(
-                        name="duration",
-                        type="number",
-                        required=True,
-                        description="Duration of capture in seconds",
-                        placeholder="60",
-                    ),
-                ],
-            ),
-        ]
+        return list(_COMMAND_TEMPLATES)
 
     def parse_results(
         self, raw_output: str, command_used: str, agent_id: str = None
     ) -> Dict[str, Any]:
         """Parse tshark output"""
-        # pylint: disable=import-outside-toplevel
-        from app.services.tools.tshark.parser import TsharkParser
+        return _parser().parse_single_result(raw_output, command_used, agent_id)
 
-        parser = TsharkParser()
-        return parser.parse_single_result(raw_output, command_used, agent_id)
+    def parse_results_stream(
+        self, stream: IO, command_used: str, agent_id: str = None
+    ) -> Dict[str, Any]:
+        """Parse tshark ``-T ek`` output straight from a stream (e.g. a pipe)"""
+        return _parser().parse_stream(stream, command_used, agent_id)
 
     def parse_version(self, raw_version: str) -> str:
         match = re.search(r"TShark \(Wireshark\) (\d+\.\d+\.\d+)", raw_version)
@@ -185,6 +189,7 @@ class TsharkTool(BaseTool):
             "count": self._validate_count,
             "pcap_file": self._validate_pcap_file,
             "filter": self._validate_filter,
+            "duration": self._validate_duration,
         }
 
         # Get the validation function for this placeholder
@@ -206,6 +211,14 @@ class TsharkTool(BaseTool):
         except ValueError:
             return False
 
+    def _validate_duration(self, value: str) -> bool:
+        """Validate duration in seconds"""
+        try:
+            duration = int(value)
+            return duration > 0
+        except ValueError:
+            return False
+
     def _validate_pcap_file(self, value: str) -> bool:
         """Validate PCAP file path"""
         return bool(value.strip())
@@ -213,34 +226,3 @@ class TsharkTool(BaseTool):
     def _validate_filter(self, value: str) -> bool:
         """Validate BPF filter"""
         return bool(value.strip())
-
-    def _validate_template_with_placeholder(
-        self, value: str, template_arg: str, placeholder_name: str
-    ) -> bool:
-        """Validate template arguments with embedded placeholders like 'duration:{duration}'"""
-        # Extract prefix and suffix
-        placeholder_start = template_arg.find("{")
-        placeholder_end = template_arg.find("}")
-
-        if placeholder_start == -1 or placeholder_end == -1:
-            return False
-
-        prefix = template_arg[:placeholder_start]
-        suffix = template_arg[placeholder_end + 1 :]
-
-        # Check if the value starts with prefix and ends with suffix
-        if not value.startswith(prefix) or not value.endswith(suffix):
-            return False
-
-        # Extract the actual placeholder value
-        placeholder_value = value[len(prefix) : len(value) - len(suffix)]
-
-        # Validate the placeholder value
-        if placeholder_name == "duration":
-            try:
-                duration = int(placeholder_value)
-                return duration > 0
-            except ValueError:
-                return False
-
-        return True
@@ -0,0 +1,6 @@
+import hashlib
+
+
+def hash_token(token: str) -> bytes:
+    """SHA-256 digest of an agent token, as stored in ``agents.token_hash``"""
+    return hashlib.sha256(token.encode()).digest()
@@ -10,6 +10,7 @@ CREATE TABLE agents (
     platform platform_type NULL,
     available_tools JSONB NULL,
     token TEXT NOT NULL,
+    token_hash BYTEA NOT NULL,
     last_seen_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT unique_agent_name UNIQUE (name),
@@ -49,6 +50,7 @@ CREATE TABLE reports_jobs (
 -- Indexes for performance
 CREATE INDEX idx_agents_last_seen ON agents(last_seen_at);
 CREATE INDEX idx_agents_platform ON agents(platform);
+CREATE INDEX idx_agents_token_hash ON agents(token_hash);
 CREATE INDEX idx_jobs_agent_id ON jobs(agent_id);
 CREATE INDEX idx_jobs_created_at ON jobs(created_at);
 CREATE INDEX idx_reports_created_at ON reports(created_at);
@@ -1,7 +1,7 @@
 BEGIN;
 
 -- Insert sample agents
-INSERT INTO agents (id, name, hostname, description, platform, available_tools, token, last_seen_at, created_at) VALUES 
+INSERT INTO agents (id, name, hostname, description, platform, available_tools, token, token_hash, last_seen_at, created_at) VALUES 
 (
     '550e8400-e29b-41d4-a716-446655440001',
     'Web Server 01',
@@ -13,6 +13,7 @@ INSERT INTO agents (id, name, hostname, description, platform, available_tools,
       {"cmd": "python", "args": [], "version": "3.8.10", "version_arg": "--version"},
       {"cmd": "docker", "args": [], "version": "20.10.7", "version_arg": "--version"}]'::jsonb,
     'tok_550e8400e29b41d4a716446655440001',
+    sha256(convert_to('tok_550e8400e29b41d4a716446655440001', 'UTF8')),
     NOW() - INTERVAL '5 minutes',
     NOW() - INTERVAL '2 days'
 ),
@@ -25,6 +26,7 @@ INSERT INTO agents (id, name, hostname, description, platform, available_tools,
     '[{"cmd": "psql", "args": [], "version": "16", "version_arg": "--version"},
       {"cmd": "pgcli", "args": [], "version": "3.4.0", "version_arg": "--version"}]'::jsonb,
     'tok_550e8400e29b41d4a716446655440002',
+    sha256(convert_to('tok_550e8400e29b41d4a716446655440002', 'UTF8')),
     NOW() - INTERVAL '1 hour',
     NOW() - INTERVAL '5 days'
 ),
@@ -36,6 +38,7 @@ INSERT INTO agents (id, name, hostname, description, platform, available_tools,
     NULL,
     '[]'::jsonb,
     'tok_550e8400e29b41d4a716446655440003',
+    sha256(convert_to('tok_550e8400e29b41d4a716446655440003', 'UTF8')),
     NOW() - INTERVAL '30 minutes',
     NOW() - INTERVAL '1 day'
 ),
@@ -47,6 +50,7 @@ INSERT INTO agents (id, name, hostname, description, platform, available_tools,
     NULL,
     '[]'::jsonb,
     'tok_550e8400e29b41d4a716446655440004',
+    sha256(convert_to('tok_550e8400e29b41d4a716446655440004', 'UTF8')),
     NOW() - INTERVAL '2 hours',
     NOW() - INTERVAL '3 days'
 );
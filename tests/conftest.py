@@ -0,0 +1,62 @@
+import httpx
+import pytest
+
+from app.core.database import get_db
+from app.main import app
+from app.services.tools.ffuf.tool import FFufTool
+from app.services.tools.nmap.tool import NmapTool
+from app.services.tools.tool_manager import ToolManager
+from app.services.tools.tshark.tool import TsharkTool
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """The app only runs on asyncio, so skip the trio variants"""
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def async_client():
+    """One in-process httpx client for the whole session, no TestClient thread
+    portal; ASGITransport never runs the lifespan (or its database connection)"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def _override_db():
+    yield None
+
+
+@pytest.fixture(autouse=True)
+def override_db(monkeypatch):
+    """Route get_db to a dummy session for every test; reverted at teardown"""
+    monkeypatch.setitem(app.dependency_overrides, get_db, _override_db)
+
+
+# Tool instances are stateless validators, so one of each serves the session
+@pytest.fixture(scope="session")
+def nmap_tool():
+    return NmapTool()
+
+
+@pytest.fixture(scope="session")
+def ffuf_tool():
+    return FFufTool()
+
+
+@pytest.fixture(scope="session")
+def tshark_tool():
+    return TsharkTool()
+
+
+@pytest.fixture(scope="session")
+def tool_manager():
+    """Real tool manager, read-only in tests"""
+    return ToolManager()
+
+
+@pytest.fixture(scope="session")
+def tools_by_id(tool_manager):
+    """Available tools listing keyed by tool id"""
+    return {tool["id"]: tool for tool in tool_manager.get_available_tools()}
@@ -0,0 +1,25 @@
+"""Shared helpers for the route tests"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import orjson
+
+# Fixed timestamp; the tests only check how datetimes serialize
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def json_body(response):
+    """Decode a response body with orjson"""
+    return orjson.loads(response.content)
+
+
+def make_service(spec, **methods):
+    """Service stand-in; callables and exceptions become side effects"""
+    service = AsyncMock(spec=spec)
+    for name, result in methods.items():
+        if callable(result) or isinstance(result, BaseException):
+            getattr(service, name).side_effect = result
+        else:
+            getattr(service, name).return_value = result
+    return service
@@ -1,220 +1,152 @@
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import partial
+from typing import Optional
 
-from fastapi.testclient import TestClient
+import pytest
 
-import app.api.v1.agents as agents_module
-from app.core.database import database, get_db
+from app.api.v1.agents import get_agents_service
+from app.core.exceptions import DeleteError
 from app.main import app
 from app.schemas.agents import PlatformType
+from app.services.agents import AgentsService
+from tests.helpers import NOW, json_body, make_service
 
 
-class FakeAgentsService:
-    async def get_agents(self):
-        class Obj:
-            id = uuid.uuid4()
-            name = "agent-1"
-            hostname = "host"
-            description = "test agent"
-            platform = PlatformType.LINUX
-            available_tools = []
-            token = "tok"
-            last_seen_at = datetime.utcnow()
-            created_at = datetime.utcnow()
-            jobs = []
-
-        return [Obj()]
-
-
-async def _override_db():
-    yield None
-
-
-def test_get_agents_ok(monkeypatch):
-    monkeypatch.setattr(agents_module, "AgentsService", lambda db: FakeAgentsService())
-    app.dependency_overrides[get_db] = _override_db
-    try:
-        # Disable real DB side-effects from app lifespan
-        monkeypatch.setattr(database, "connect", lambda: None)
-        monkeypatch.setattr(database, "create_tables", lambda: None)
-        monkeypatch.setattr(database, "disconnect", lambda: None)
-
-        client = TestClient(app)
-        r = client.get("/api/v1/agents")
-        assert r.status_code == 200
-        body = r.json()
-        assert isinstance(body.get("data"), list)
-        first = body["data"][0]
-        assert first.get("type") == "agents"
-        assert first.get("attributes", {}).get("name") == "agent-1"
-    finally:
-        app.dependency_overrides.clear()
-
-
-def test_create_agent_ok(monkeypatch):
-    class FakeCreateService:
-        async def create_agent(self, agent_create):
-            class Obj:
-                id = uuid.uuid4()
-                name = agent_create.name
-                hostname = None
-                description = agent_create.description
-                platform = PlatformType.LINUX
-                available_tools = []
-                token = "tok"
-                last_seen_at = datetime.utcnow()
-                created_at = datetime.utcnow()
-
-            return Obj()
-
-    monkeypatch.setattr(agents_module, "AgentsService", lambda db: FakeCreateService())
-    app.dependency_overrides[get_db] = _override_db
-    try:
-        monkeypatch.setattr(database, "connect", lambda: None)
-        monkeypatch.setattr(database, "create_tables", lambda: None)
-        monkeypatch.setattr(database, "disconnect", lambda: None)
-
-        client = TestClient(app)
-        payload = {"name": "agent-x", "description": "desc"}
-        r = client.post("/api/v1/agents", json=payload)
-        assert r.status_code == 200
-        body = r.json()
-        assert body.get("data", {}).get("type") == "agents"
-        assert body["data"]["attributes"]["hostname"] is None
-        assert body["data"]["attributes"]["description"] == "desc"
-    finally:
-        app.dependency_overrides.clear()
-
-
-def test_update_agent_ok(monkeypatch):
+@dataclass
+class FakeAgent:
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    name: str = "agent-1"
+    hostname: Optional[str] = "host"
+    description: Optional[str] = "test agent"
+    platform: PlatformType = PlatformType.LINUX
+    available_tools: list = field(default_factory=list)
+    token: str = "tok"
+    last_seen_at: datetime = NOW
+    created_at: datetime = NOW
+    jobs: list = field(default_factory=list)
+
+
+_service = partial(make_service, AgentsService)
+
+
+@pytest.fixture
+def use_service(monkeypatch):
+    """Serve the agents routes from the given service stand-in"""
+
+    def _use(service):
+        monkeypatch.setitem(
+            app.dependency_overrides, get_agents_service, lambda: service
+        )
+
+    return _use
+
+
+@pytest.mark.anyio
+async def test_get_agents_ok(use_service, async_client):
+    service = _service(get_agents=[FakeAgent()])
+    use_service(service)
+
+    r = await async_client.get("/api/v1/agents")
+    assert r.status_code == 200
+    body = json_body(r)
+    assert isinstance(body.get("data"), list)
+    first = body["data"][0]
+    assert first.get("type") == "agents"
+    assert first.get("attributes", {}).get("name") == "agent-1"
+
+
+@pytest.mark.anyio
+async def test_create_agent_ok(use_service, async_client):
+    service = _service(
+        create_agent=lambda agent_create: FakeAgent(
+            name=agent_create.name,
+            hostname=None,
+            description=agent_create.description,
+        )
+    )
+    use_service(service)
+
+    payload = {"name": "agent-x", "description": "desc"}
+    r = await async_client.post("/api/v1/agents", json=payload)
+    assert r.status_code == 200
+    body = json_body(r)
+    assert body.get("data", {}).get("type") == "agents"
+    assert body["data"]["attributes"]["hostname"] is None
+    assert body["data"]["attributes"]["description"] == "desc"
+
+
+@pytest.mark.anyio
+async def test_update_agent_ok(use_service, async_client):
     agent_id = str(uuid.uuid4())
 
-    class FakeUpdateService:
-        async def update_agent(self, _agent_id, agent_update):
-            class Obj:
-                id = uuid.UUID(agent_id)
-                name = agent_update.name or "agent-1"
-                hostname = "host"
-                description = agent_update.description or "test agent"
-                platform = PlatformType.LINUX
-                available_tools = []
-                token = "tok"
-                last_seen_at = datetime.utcnow()
-                created_at = datetime.utcnow()
-
-            return Obj()
-
-    monkeypatch.setattr(agents_module, "AgentsService", lambda db: FakeUpdateService())
-    app.dependency_overrides[get_db] = _override_db
-    try:
-        monkeypatch.setattr(database, "connect", lambda: None)
-        monkeypatch.setattr(database, "create_tables", lambda: None)
-        monkeypatch.setattr(database, "disconnect", lambda: None)
-
-        client = TestClient(app)
-        payload = {"name": "agent-updated"}
-        r = client.patch(f"/api/v1/agents/{agent_id}", json=payload)
-        assert r.status_code == 200
-        body = r.json()
-        assert body.get("data", {}).get("type") == "agents"
-        assert body["data"]["id"] == agent_id
-        assert body["data"]["attributes"]["hostname"] == "host"
-    finally:
-        app.dependency_overrides.clear()
-
-
-def test_create_agent_invalid_payload(monkeypatch):
+    service = _service(
+        update_agent=lambda _agent_id, agent_update: FakeAgent(
+            id=uuid.UUID(agent_id),
+            name=agent_update.name or "agent-1",
+            description=agent_update.description or "test agent",
+        )
+    )
+    use_service(service)
+
+    payload = {"name": "agent-updated"}
+    r = await async_client.patch(f"/api/v1/agents/{agent_id}", json=payload)
+    assert r.status_code == 200
+    body = json_body(r)
+    assert body.get("data", {}).get("type") == "agents"
+    assert body["data"]["id"] == agent_id
+    assert body["data"]["attributes"]["hostname"] == "host"
+
+
+@pytest.mark.anyio
+async def test_create_agent_invalid_payload(use_service, async_client):
     # Missing required field 'name'
-    class FakeService:
-        async def create_agent(self, agent_create):
-            raise AssertionError("Should not be called due to validation error")
-
-    monkeypatch.setattr(agents_module, "AgentsService", lambda db: FakeService())
-    app.dependency_overrides[get_db] = _override_db
-    try:
-        monkeypatch.setattr(database, "connect", lambda: None)
-        monkeypatch.setattr(database, "create_tables", lambda: None)
-        monkeypatch.setattr(database, "disconnect", lambda: None)
-
-        client = TestClient(app)
-        r = client.post("/api/v1/agents", json={"description": "desc"})
-        assert r.status_code in (400, 422)
-        body = r.json()
-        assert "errors" in body
-        assert isinstance(body["errors"], list)
-    finally:
-        app.dependency_overrides.clear()
-
-
-def test_delete_agent_ok_and_not_found(monkeypatch):
+    service = _service()
+    use_service(service)
+
+    r = await async_client.post("/api/v1/agents", json={"description": "desc"})
+    assert r.status_code in (400, 422)
+    body = json_body(r)
+    assert "errors" in body
+    assert isinstance(body["errors"], list)
+    service.create_agent.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_delete_agent_ok_and_not_found(use_service, async_client):
     agent_id_ok = str(uuid.uuid4())
     agent_id_missing = str(uuid.uuid4())
 
-    class FakeDeleteService:
-        async def delete_agent(self, agent_id: str):
-            if agent_id == agent_id_missing:
-                from app.core.exceptions import DeleteError
-
-                raise DeleteError("not found")
-            return None
-
-    monkeypatch.setattr(agents_module, "AgentsService", lambda db: FakeDeleteService())
-    app.dependency_overrides[get_db] = _override_db
-    try:
-        monkeypatch.setattr(database, "connect", lambda: None)
-        monkeypatch.setattr(database, "create_tables", lambda: None)
-        monkeypatch.setattr(database, "disconnect", lambda: None)
-
-        client = TestClient(app)
-        # OK case
-        r_ok = client.delete(f"/api/v1/agents/{agent_id_ok}")
-        assert r_ok.status_code == 200
-        assert (
-            r_ok.json().get("data", {}).get("attributes", {}).get("message")
-            == "Agent deleted"
-        )
+    def delete_agent(agent_id: str):
+        if agent_id == agent_id_missing:
+            raise DeleteError("not found")
 
-        # Not found case
-        r_nf = client.delete(f"/api/v1/agents/{agent_id_missing}")
-        assert r_nf.status_code == 404
-        assert "errors" in r_nf.json()
-    finally:
-        app.dependency_overrides.clear()
-
-
-def test_agents_datetime_fields_are_iso(monkeypatch):
-    class FakeAgentsServiceISO:
-        async def get_agents(self):
-            class Obj:
-                id = uuid.uuid4()
-                name = "agent-iso"
-                hostname = "host"
-                description = "desc"
-                platform = PlatformType.LINUX
-                available_tools = []
-                token = "tok"
-                last_seen_at = datetime.utcnow()
-                created_at = datetime.utcnow()
-                jobs = []
-
-            return [Obj()]
-
-    monkeypatch.setattr(
-        agents_module, "AgentsService", lambda db: FakeAgentsServiceISO()
+    service = _service(delete_agent=delete_agent)
+    use_service(service)
+
+    # OK case
+    r_ok = await async_client.delete(f"/api/v1/agents/{agent_id_ok}")
+    assert r_ok.status_code == 200
+    assert (
+        json_body(r_ok).get("data", {}).get("attributes", {}).get("message")
+        == "Agent deleted"
     )
-    app.dependency_overrides[get_db] = _override_db
-    try:
-        monkeypatch.setattr(database, "connect", lambda: None)
-        monkeypatch.setattr(database, "create_tables", lambda: None)
-        monkeypatch.setattr(database, "disconnect", lambda: None)
-
-        client = TestClient(app)
-        r = client.get("/api/v1/agents")
-        assert r.status_code == 200
-        attrs = r.json()["data"][0]["attributes"]
-        # Ensure ISO-like strings
-        assert isinstance(attrs["created_at"], str) and "T" in attrs["created_at"]
-        if attrs.get("last_seen_at") is not None:
-            assert isinstance(attrs["last_seen_at"], str)
-    finally:
-        app.dependency_overrides.clear()
+
+    # Not found case
+    r_nf = await async_client.delete(f"/api/v1/agents/{agent_id_missing}")
+    assert r_nf.status_code == 404
+    assert "errors" in json_body(r_nf)
+
+
+@pytest.mark.anyio
+async def test_agents_datetime_fields_are_iso(use_service, async_client):
+    service = _service(get_agents=[FakeAgent(name="agent-iso", description="desc")])
+    use_service(service)
+
+    r = await async_client.get("/api/v1/agents")
+    assert r.status_code == 200
+    attrs = json_body(r)["data"][0]["attributes"]
+    # Ensure ISO strings
+    assert attrs["created_at"] == NOW.isoformat()
+    assert attrs["last_seen_at"] == NOW.isoformat()
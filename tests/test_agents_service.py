@@ -0,0 +1,103 @@
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.models.agents import Agents
+from app.schemas.agents import AgentCreate, AgentUpdate
+from app.services.agents import AgentsService
+from app.utils.token import hash_token
+
+
+class FakeSession:
+    """Just enough of AsyncSession to run AgentsService against a list of agents
+
+    Statements are matched on their bound parameters, so ``Agents.id == x``
+    and ``Agents.token_hash == y`` both resolve against the stored agents.
+    """
+
+    def __init__(self, *agents):
+        self.agents = list(agents)
+
+    async def execute(self, statement):
+        criteria = {
+            key.rsplit("_", 1)[0]: value
+            for key, value in statement.compile().params.items()
+        }
+        matches = [
+            agent
+            for agent in self.agents
+            if all(
+                getattr(agent, column) == value for column, value in criteria.items()
+            )
+        ]
+        return MagicMock(
+            **{"scalar_one_or_none.return_value": matches[0] if matches else None}
+        )
+
+    def add(self, agent):
+        if agent not in self.agents:
+            self.agents.append(agent)
+
+    async def delete(self, agent):
+        self.agents.remove(agent)
+
+    async def commit(self):
+        pass
+
+
+def _agent(token):
+    return Agents(
+        id=uuid.uuid4(), name="agent-1", token=token, token_hash=hash_token(token)
+    )
+
+
+@pytest.mark.anyio
+async def test_get_agent_by_token():
+    agent = _agent("tok")
+    service = AgentsService(FakeSession(agent))
+
+    assert await service.get_agent_by_token("tok") is agent
+    assert await service.get_agent_by_token("other") is None
+
+
+@pytest.mark.anyio
+async def test_create_agent_sets_token_hash():
+    service = AgentsService(FakeSession())
+
+    agent = await service.create_agent(AgentCreate(name="agent-1", description=""))
+
+    assert agent.token_hash == hash_token(agent.token)
+
+
+@pytest.mark.anyio
+async def test_update_agent_sets_token_hash():
+    agent = _agent("old")
+    service = AgentsService(FakeSession(agent))
+
+    await service.update_agent(agent.id, AgentUpdate(token="new"))
+
+    assert agent.token_hash == hash_token("new")
+
+
+@pytest.mark.anyio
+async def test_rotated_token_stops_resolving():
+    agent = _agent("old")
+    service = AgentsService(FakeSession(agent))
+    assert await service.get_agent_by_token("old") is agent
+
+    await service.update_agent(agent.id, AgentUpdate(token="new"))
+
+    assert await service.get_agent_by_token("old") is None
+    assert await service.get_agent_by_token("new") is agent
+
+
+@pytest.mark.anyio
+async def test_deleted_agent_token_stops_resolving():
+    agent = _agent("tok")
+    service = AgentsService(FakeSession(agent))
+    assert await service.get_agent_by_token("tok") is agent
+
+    await service.delete_agent(agent.id)
+
+    assert await service.get_agent_by_token("tok") is None
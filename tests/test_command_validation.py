@@ -1,258 +1,123 @@
 import pytest
 
-from app.services.tools.ffuf.tool import FFufTool
-from app.services.tools.nmap.tool import NmapTool
-from app.services.tools.tshark.tool import TsharkTool
+from app.services.tools.tshark.parser import PARSED_FIELDS
+
+
+_FFUF_BASE = ("ffuf", "-w", "/usr/share/wordlists/dirb/common.txt", "-u")
+
+NMAP_COMMANDS = (
+    (("nmap", "-sT", "-p", "80,443", "192.168.1.1"), True),
+    (("nmap", "-sS", "-p", "80-90", "scanme.nmap.org"), True),
+    (("nmap", "-A", "192.168.1.0/24"), True),
+    (("nmap", "-O", "192.168.1.1"), True),
+    (("nmap", "-sT", "-p", "invalid_port", "192.168.1.1"), False),
+    (("nmap", "-sT", "-p", "99999", "192.168.1.1"), False),
+    (("nmap", "invalid", "command"), False),
+    (("nmap", "-sT", "-p", "0", "192.168.1.1"), False),  # Port 0 is invalid
+)
+
+NMAP_PORT_COMMANDS = (
+    (("nmap", "-sT", "-p", "1-100", "192.168.1.1"), True),
+    (("nmap", "-sT", "-p", "80,443,8080", "192.168.1.1"), True),
+    (("nmap", "-sT", "-p", "65535", "192.168.1.1"), True),
+    (("nmap", "-sT", "-p", "100-50", "192.168.1.1"), False),  # Reverse range
+    (("nmap", "-sT", "-p", "0-100", "192.168.1.1"), False),  # Port 0
+    (("nmap", "-sT", "-p", "100-70000", "192.168.1.1"), False),  # Port > 65535
+)
+
+FFUF_COMMANDS = (
+    (_FFUF_BASE + ("https://example.com/FUZZ",), True),
+    (_FFUF_BASE + ("https://example.com/FUZZ", "-mc", "200,301"), True),
+    (_FFUF_BASE + ("https://example.com/FUZZ", "-fs", "1234"), True),
+    (_FFUF_BASE + ("https://example.com/",), False),  # No FUZZ
+    (_FFUF_BASE + ("https://example.com/FUZZ", "-mc", "999"), False),  # Bad code
+    (_FFUF_BASE + ("https://example.com/FUZZ", "-fs", "0"), False),  # Size 0
+)
+
+FFUF_URLS = (
+    ("https://example.com/FUZZ", True),
+    ("http://test.com/admin/FUZZ", True),
+    ("https://site.org/api/v1/FUZZ", True),
+    ("https://example.com/", False),
+    ("http://test.com/admin", False),
+    ("https://site.org/api/v1", False),
+)
+
+TSHARK_COMMANDS = (
+    (("tshark", "-i", "eth0", "-c", "100", "-a", "duration:60"), True),
+    (("tshark", "-r", "capture.pcap", "-a", "duration:300"), True),
+    (
+        ("tshark", "-r", "capture.pcap", "-Y", "tcp.port == 80", "-a", "duration:300"),
+        True,
+    ),
+    (("tshark", "-i", "eth0", "-a", "duration:60"), True),
+    (
+        ("tshark", "-i", "eth0", "-c", "invalid", "-a", "duration:60"),
+        False,
+    ),  # Invalid count
+    (("tshark", "-i", "eth0", "-c", "100", "-a", "duration:0"), False),  # Duration 0
+    (
+        ("tshark", "-i", "eth0", "-c", "-1", "-a", "duration:60"),
+        False,
+    ),  # Negative count
+)
+
+TSHARK_DURATIONS = (
+    ("duration:60", True),
+    ("duration:300", True),
+    ("duration:1", True),
+    ("duration:0", False),
+    ("duration:-1", False),
+    ("duration:abc", False),
+)
 
 
 class TestNmapValidation:
     """Test nmap command validation"""
 
-    @pytest.fixture
-    def nmap_tool(self):
-        return NmapTool()
-
-    def test_valid_nmap_commands(self, nmap_tool):
-        """Test valid nmap commands"""
-        valid_cmds = [
-            ["nmap", "-sT", "-p", "80,443", "192.168.1.1"],
-            ["nmap", "-sS", "-p", "80-90", "scanme.nmap.org"],
-            ["nmap", "-A", "192.168.1.0/24"],
-            ["nmap", "-O", "192.168.1.1"],
-        ]
-
-        for cmd in valid_cmds:
-            assert (
-                nmap_tool.validate_command(cmd) is True
-            ), f"Command {cmd} should be valid"
-
-    def test_invalid_nmap_commands(self, nmap_tool):
-        """Test invalid nmap commands"""
-        invalid_cmds = [
-            ["nmap", "-sT", "-p", "invalid_port", "192.168.1.1"],
-            ["nmap", "-sT", "-p", "99999", "192.168.1.1"],
-            ["nmap", "invalid", "command"],
-            ["nmap", "-sT", "-p", "0", "192.168.1.1"],  # Port 0 is invalid
-        ]
-
-        for cmd in invalid_cmds:
-            assert (
-                nmap_tool.validate_command(cmd) is False
-            ), f"Command {cmd} should be invalid"
-
-    def test_nmap_port_validation(self, nmap_tool):
+    @pytest.mark.parametrize("cmd,expected", NMAP_COMMANDS)
+    def test_nmap_commands(self, nmap_tool, cmd, expected):
+        """Test valid and invalid nmap commands"""
+        assert nmap_tool.validate_command(cmd) is expected
+
+    @pytest.mark.parametrize("cmd,expected", NMAP_PORT_COMMANDS)
+    def test_nmap_port_validation(self, nmap_tool, cmd, expected):
         """Test specific port validation scenarios"""
-        # Valid port ranges
-        valid_port_cmds = [
-            ["nmap", "-sT", "-p", "1-100", "192.168.1.1"],
-            ["nmap", "-sT", "-p", "80,443,8080", "192.168.1.1"],
-            ["nmap", "-sT", "-p", "65535", "192.168.1.1"],
-        ]
-
-        for cmd in valid_port_cmds:
-            assert (
-                nmap_tool.validate_command(cmd) is True
-            ), f"Port command {cmd} should be valid"
-
-        # Invalid port ranges
-        invalid_port_cmds = [
-            ["nmap", "-sT", "-p", "100-50", "192.168.1.1"],  # Reverse range
-            ["nmap", "-sT", "-p", "0-100", "192.168.1.1"],  # Port 0
-            ["nmap", "-sT", "-p", "100-70000", "192.168.1.1"],  # Port > 65535
-        ]
-
-        for cmd in invalid_port_cmds:
-            assert (
-                nmap_tool.validate_command(cmd) is False
-            ), f"Port command {cmd} should be invalid"
+        assert nmap_tool.validate_command(cmd) is expected
 
 
 class TestFFufValidation:
     """Test ffuf command validation"""
 
-    @pytest.fixture
-    def ffuf_tool(self):
-        return FFufTool()
-
-    def test_valid_ffuf_commands(self, ffuf_tool):
-        """Test valid ffuf commands"""
-        valid_cmds = [
-            [
-                "ffuf",
-                "-w",
-                "/usr/share/wordlists/dirb/common.txt",
-                "-u",
-                "https://example.com/FUZZ",
-            ],
-            [
-                "ffuf",
-                "-w",
-                "/usr/share/wordlists/dirb/common.txt",
-                "-u",
-                "https://example.com/FUZZ",
-                "-mc",
-                "200,301",
-            ],
-            [
-                "ffuf",
-                "-w",
-                "/usr/share/wordlists/dirb/common.txt",
-                "-u",
-                "https://example.com/FUZZ",
-                "-fs",
-                "1234",
-            ],
-        ]
-
-        for cmd in valid_cmds:
-            assert (
-                ffuf_tool.validate_command(cmd) is True
-            ), f"Command {cmd} should be valid"
-
-    def test_invalid_ffuf_commands(self, ffuf_tool):
-        """Test invalid ffuf commands"""
-        invalid_cmds = [
-            [
-                "ffuf",
-                "-w",
-                "/usr/share/wordlists/dirb/common.txt",
-                "-u",
-                "https://example.com/",
-            ],  # No FUZZ
-            [
-                "ffuf",
-                "-w",
-                "/usr/share/wordlists/dirb/common.txt",
-                "-u",
-                "https://example.com/FUZZ",
-                "-mc",
-                "999",
-            ],  # Invalid HTTP code
-            [
-                "ffuf",
-                "-w",
-                "/usr/share/wordlists/dirb/common.txt",
-                "-u",
-                "https://example.com/FUZZ",
-                "-fs",
-                "0",
-            ],  # Size 0
-        ]
-
-        for cmd in invalid_cmds:
-            assert (
-                ffuf_tool.validate_command(cmd) is False
-            ), f"Command {cmd} should be invalid"
-
-    def test_ffuf_url_validation(self, ffuf_tool):
+    @pytest.mark.parametrize("cmd,expected", FFUF_COMMANDS)
+    def test_ffuf_commands(self, ffuf_tool, cmd, expected):
+        """Test valid and invalid ffuf commands"""
+        assert ffuf_tool.validate_command(cmd) is expected
+
+    @pytest.mark.parametrize("url,expected", FFUF_URLS)
+    def test_ffuf_url_validation(self, ffuf_tool, url, expected):
         """Test URL validation with FUZZ placeholder"""
-        # Valid URLs with FUZZ
-        valid_urls = [
-            "https://example.com/FUZZ",
-            "http://test.com/admin/FUZZ",
-            "https://site.org/api/v1/FUZZ",
-        ]
-
-        for url in valid_urls:
-            cmd = ["ffuf", "-w", "/usr/share/wordlists/dirb/common.txt", "-u", url]
-            assert ffuf_tool.validate_command(cmd) is True, f"URL {url} should be valid"
-
-        # Invalid URLs without FUZZ
-        invalid_urls = [
-            "https://example.com/",
-            "http://test.com/admin",
-            "https://site.org/api/v1",
-        ]
-
-        for url in invalid_urls:
-            cmd = ["ffuf", "-w", "/usr/share/wordlists/dirb/common.txt", "-u", url]
-            assert (
-                ffuf_tool.validate_command(cmd) is False
-            ), f"URL {url} should be invalid"
+        assert ffuf_tool.validate_command(_FFUF_BASE + (url,)) is expected
 
 
 class TestTsharkValidation:
     """Test tshark command validation"""
 
-    @pytest.fixture
-    def tshark_tool(self):
-        return TsharkTool()
-
-    def test_valid_tshark_commands(self, tshark_tool):
-        """Test valid tshark commands"""
-        valid_cmds = [
-            ["tshark", "-i", "eth0", "-c", "100", "-a", "duration:60"],
-            ["tshark", "-r", "capture.pcap", "-a", "duration:300"],
-            [
-                "tshark",
-                "-r",
-                "capture.pcap",
-                "-Y",
-                "tcp.port == 80",
-                "-a",
-                "duration:300",
-            ],
-            ["tshark", "-i", "eth0", "-a", "duration:60"],
-        ]
-
-        for cmd in valid_cmds:
-            assert (
-                tshark_tool.validate_command(cmd) is True
-            ), f"Command {cmd} should be valid"
-
-    def test_invalid_tshark_commands(self, tshark_tool):
-        """Test invalid tshark commands"""
-        invalid_cmds = [
-            [
-                "tshark",
-                "-i",
-                "eth0",
-                "-c",
-                "invalid",
-                "-a",
-                "duration:60",
-            ],  # Invalid count
-            ["tshark", "-i", "eth0", "-c", "100", "-a", "duration:0"],  # Duration 0
-            ["tshark", "-i", "eth0", "-c", "-1", "-a", "duration:60"],  # Negative count
-        ]
-
-        for cmd in invalid_cmds:
-            assert (
-                tshark_tool.validate_command(cmd) is False
-            ), f"Command {cmd} should be invalid"
-
-    def test_tshark_duration_validation(self, tshark_tool):
+    @pytest.mark.parametrize("cmd,expected", TSHARK_COMMANDS)
+    def test_tshark_commands(self, tshark_tool, cmd, expected):
+        """Test valid and invalid tshark commands"""
+        assert tshark_tool.validate_command(cmd) is expected
+
+    @pytest.mark.parametrize("duration,expected", TSHARK_DURATIONS)
+    def test_tshark_duration_validation(self, tshark_tool, duration, expected):
         """Test duration validation with prefix/suffix format"""
-        # Valid durations
-        valid_durations = [
-            "duration:60",
-            "duration:300",
-            "duration:1",
-        ]
-
-        for duration in valid_durations:
-            cmd = ["tshark", "-i", "eth0", "-a", duration]
-            assert (
-                tshark_tool.validate_command(cmd) is True
-            ), f"Duration {duration} should be valid"
-
-        # Invalid durations
-        invalid_durations = [
-            "duration:0",
-            "duration:-1",
-            "duration:abc",
-        ]
-
-        for duration in invalid_durations:
-            cmd = ["tshark", "-i", "eth0", "-a", duration]
-            assert (
-                tshark_tool.validate_command(cmd) is False
-            ), f"Duration {duration} should be invalid"
-
-
-def test_all_tools_implement_validate_command():
+        cmd = ("tshark", "-i", "eth0", "-a", duration)
+        assert tshark_tool.validate_command(cmd) is expected
+
+
+def test_all_tools_implement_validate_command(nmap_tool, ffuf_tool, tshark_tool):
     """Test that all tools implement the validate_command method"""
-    tools = [NmapTool(), FFufTool(), TsharkTool()]
+    tools = [nmap_tool, ffuf_tool, tshark_tool]
 
     for tool in tools:
         assert hasattr(
@@ -263,23 +128,17 @@ def test_all_tools_implement_validate_command():
         ), f"Tool {tool.__class__.__name__} validate_command is not callable"
 
 
-def test_export_arguments_are_added():
+def test_export_arguments_are_added(nmap_tool, ffuf_tool, tshark_tool):
     """Test that export arguments are automatically added to validated commands"""
 
     # Test Nmap
-    nmap = NmapTool()
     cmd = ["nmap", "-sT", "-p", "80,443", "192.168.1.1"]
-    is_valid, complete_cmd = nmap.validate_and_prepare_command(cmd)
-    print(f"Nmap command: {cmd}")
-    print(f"Complete command: {complete_cmd}")
-    print(f"Export format: {nmap.export_format}")
-    print(f"Export args: {nmap.export_arguments}")
+    is_valid, complete_cmd = nmap_tool.validate_and_prepare_command(cmd)
     assert is_valid is True
     assert complete_cmd[0] == "nmap"
-    assert complete_cmd[-2:] == ["-oX", "-"]  # Nmap exports to XML
+    assert complete_cmd[-2:] == ["-oX", "-"], complete_cmd  # Nmap exports to XML
 
     # Test FFuf
-    ffuf = FFufTool()
     cmd = [
         "ffuf",
         "-w",
@@ -287,35 +146,35 @@ def test_export_arguments_are_added():
         "-u",
         "https://example.com/FUZZ",
     ]
-    is_valid, complete_cmd = ffuf.validate_and_prepare_command(cmd)
-    print(f"\nFFuf command: {cmd}")
-    print(f"Complete command: {complete_cmd}")
-    print(f"Export format: {ffuf.export_format}")
-    print(f"Export args: {ffuf.export_arguments}")
+    is_valid, complete_cmd = ffuf_tool.validate_and_prepare_command(cmd)
     assert is_valid is True
     assert complete_cmd[0] == "ffuf"
     # FFuf has 4 export arguments: ['-of', 'json', '-o', '-']
-    assert complete_cmd[-4:] == ["-o", "/dev/stdout", "-of", "json"]
+    assert complete_cmd[-4:] == ["-o", "/dev/stdout", "-of", "json"], complete_cmd
 
     # Test Tshark
-    tshark = TsharkTool()
     cmd = ["tshark", "-i", "eth0", "-c", "100", "-a", "duration:60"]
-    is_valid, complete_cmd = tshark.validate_and_prepare_command(cmd)
-    print(f"\nTshark command: {cmd}")
-    print(f"Complete command: {complete_cmd}")
-    print(f"Export format: {tshark.export_format}")
-    print(f"Export args: {tshark.export_arguments}")
+    is_valid, complete_cmd = tshark_tool.validate_and_prepare_command(cmd)
     assert is_valid is True
     assert complete_cmd[0] == "tshark"
-    assert complete_cmd[-2:] == ["-T", "json"]  # Tshark exports to JSON
+    export_args = tshark_tool.export_arguments
+    assert complete_cmd[-len(export_args) :] == export_args, complete_cmd  # NDJSON
+
+
+def test_tshark_export_arguments_narrow_to_parsed_fields(tshark_tool):
+    """Test that tshark exports ek output limited to the fields the parser reads"""
+    arguments = tshark_tool.export_arguments
+    assert tshark_tool.export_format == "ndjson"
+    assert arguments[:2] == ["-T", "ek"]
+    assert arguments[2::2] == ["-e"] * len(PARSED_FIELDS)
+    assert arguments[3::2] == list(PARSED_FIELDS)
+    # Packets without these are skipped by the parser
+    assert {"frame.number", "frame.time_epoch"} <= set(arguments[3::2])
 
 
-def test_invalid_commands_return_false():
+def test_invalid_commands_return_false(nmap_tool):
     """Test that invalid commands return False and empty list"""
-    nmap = NmapTool()
     invalid_cmd = ["nmap", "-sT", "-p", "invalid_port", "192.168.1.1"]
-    is_valid, complete_cmd = nmap.validate_and_prepare_command(invalid_cmd)
-    print(f"Invalid nmap command: {invalid_cmd}")
-    print(f"Result: valid={is_valid}, command={complete_cmd}")
+    is_valid, complete_cmd = nmap_tool.validate_and_prepare_command(invalid_cmd)
     assert is_valid is False
     assert complete_cmd == []
@@ -1,24 +1,11 @@
-from unittest.mock import AsyncMock
-
 import pytest
 
 from app.schemas.jobs import JobAction, JobCreate
-from app.services.tools.tool_manager import ToolManager
 
 
 class TestJobCreation:
     """Test job creation functionality"""
 
-    @pytest.fixture
-    def mock_db(self):
-        """Mock database session"""
-        return AsyncMock()
-
-    @pytest.fixture
-    def tool_manager(self):
-        """Real tool manager for testing"""
-        return ToolManager()
-
     def test_create_valid_nmap_job(self, tool_manager):
         """Test creating a valid Nmap job"""
         # Create job action
@@ -217,13 +204,10 @@ class TestJobCreation:
 class TestToolVariants:
     """Test tool variants functionality"""
 
-    def test_available_variants(self):
+    def test_available_variants(self, tools_by_id):
         """Test that all expected variants are available"""
-        manager = ToolManager()
-        tools = manager.get_available_tools()
-
         # Check Nmap variants
-        nmap_tool = next(t for t in tools if t["id"] == "nmap")
+        nmap_tool = tools_by_id["nmap"]
         nmap_variants = [v["id"] for v in nmap_tool["attributes"]["variants"]]
 
         expected_nmap_variants = [
@@ -239,7 +223,7 @@ class TestToolVariants:
             assert variant in nmap_variants, f"Missing Nmap variant: {variant}"
 
         # Check FFuf variants
-        ffuf_tool = next(t for t in tools if t["id"] == "ffuf")
+        ffuf_tool = tools_by_id["ffuf"]
         ffuf_variants = [v["id"] for v in ffuf_tool["attributes"]["variants"]]
 
         expected_ffuf_variants = [
@@ -251,13 +235,10 @@ class TestToolVariants:
         for variant in expected_ffuf_variants:
             assert variant in ffuf_variants, f"Missing FFuf variant: {variant}"
 
-    def test_variant_argument_definitions(self):
+    def test_variant_argument_definitions(self, tools_by_id):
         """Test that variants have proper argument definitions"""
-        manager = ToolManager()
-        tools = manager.get_available_tools()
-
         # Test Nmap TCP Connect Scan
-        nmap_tool = next(t for t in tools if t["id"] == "nmap")
+        nmap_tool = tools_by_id["nmap"]
         tcp_scan_variant = next(
             v
             for v in nmap_tool["attributes"]["variants"]
@@ -275,7 +256,7 @@ class TestToolVariants:
         assert len(required_args) == 2
 
         # Test FFuf Directory Fuzzing
-        ffuf_tool = next(t for t in tools if t["id"] == "ffuf")
+        ffuf_tool = tools_by_id["ffuf"]
         dir_fuzzing_variant = next(
             v
             for v in ffuf_tool["attributes"]["variants"]
@@ -1,48 +1,41 @@
-import sys
+import re
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 
 import pytest
 
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
-
 from app.services.tools.ffuf.parser import FFufParser
 from app.services.tools.nmap.parser import NmapParser
-from app.services.tools.tool_manager import ToolManager
 from app.services.tools.tshark.parser import TsharkParser
 
+_VALID_SEVERITIES = frozenset({"low", "medium", "high", "critical", "info"})
 
-@pytest.fixture
-def sample_data():
-    """Fixture to provide sample data for testing"""
-    sample_data = {}
+# What each tool's finding targets should contain
+_TARGET_PATTERNS = {
+    # Nmap targets contain IP addresses or hostnames (or host:port)
+    "nmap": re.compile(r"192\.168\.1\.1|router\.local|internetbox\.home|:"),
+    # FFuf targets are URLs
+    "ffuf": re.compile(r"https?://|example\.com"),
+    # Tshark targets contain protocol information or IP addresses
+    "tshark": re.compile(
+        r"arp|tcp|udp|eth|packet|→|172\.21|192\.168|10\.0|127\.0", re.IGNORECASE
+    ),
+}
 
-    # Load Nmap sample
-    nmap_sample_path = (
-        backend_dir / "app" / "services" / "tools" / "nmap" / "sample.xml"
-    )
-    if nmap_sample_path.exists():
-        with open(nmap_sample_path, "r") as f:
-            sample_data["nmap"] = f.read()
 
-    # Load FFuf sample
-    ffuf_sample_path = (
-        backend_dir / "app" / "services" / "tools" / "ffuf" / "sample.json"
-    )
-    if ffuf_sample_path.exists():
-        with open(ffuf_sample_path, "r") as f:
-            sample_data["ffuf"] = f.read()
-
-    # Load Tshark sample
-    tshark_sample_path = (
-        backend_dir / "app" / "services" / "tools" / "tshark" / "sample.json"
-    )
-    if tshark_sample_path.exists():
-        with open(tshark_sample_path, "r") as f:
-            sample_data["tshark"] = f.read()
-
-    return sample_data
+@pytest.fixture(scope="session")
+def sample_data():
+    """Sample tool outputs, read from disk once per test session"""
+    tools_dir = Path(__file__).resolve().parent.parent / "app" / "services" / "tools"
+    sample_paths = {
+        "nmap": tools_dir / "nmap" / "sample.xml",
+        "ffuf": tools_dir / "ffuf" / "sample.json",
+        "tshark": tools_dir / "tshark" / "sample.json",
+    }
+    return {
+        tool: path.read_text() for tool, path in sample_paths.items() if path.exists()
+    }
 
 
 @pytest.fixture
@@ -76,65 +69,63 @@ def mock_jobs(sample_data):
     ]
 
 
-@pytest.fixture
-def tool_manager():
-    """Fixture to provide ToolManager instance"""
-    return ToolManager()
-
-
-class TestParsers:
-    """Test class for individual parsers"""
+@pytest.fixture(scope="session")
+def parsers():
+    """One parser instance per tool"""
+    return {"nmap": NmapParser(), "ffuf": FFufParser(), "tshark": TsharkParser()}
 
-    def test_nmap_parser_with_sample_data(self, sample_data):
-        """Test Nmap parser with sample XML data"""
-        if "nmap" not in sample_data:
-            pytest.skip("Nmap sample data not available")
 
-        parser = NmapParser()
-        result = parser.parse_single_result(
-            sample_data["nmap"],
-            "nmap -sS -p 22,80,443,8080 192.168.1.1",
-            "test_agent_001",
+@pytest.fixture(scope="session")
+def parsed_results(tool_manager, sample_data):
+    """Each sample parsed once through ToolManager, shared by the report tests"""
+    return {
+        tool: tool_manager.parse_results(
+            tool, data, f"{tool} test command", f"test_agent_{tool}"
         )
+        for tool, data in sample_data.items()
+    }
 
-        # Verify structure
-        assert "findings" in result
-        assert "statistics" in result
-        assert isinstance(result["findings"], list)
-        assert isinstance(result["statistics"], dict)
 
-        # Verify findings
-        assert len(result["findings"]) > 0
+def _assert_finding_shape(finding):
+    for key in ("id", "title", "description", "target", "severity", "timestamp"):
+        assert key in finding
 
-        # Verify statistics
-        stats = result["statistics"]
-        assert "total_hosts" in stats
-        assert "up_hosts" in stats
-        assert "open_ports" in stats
 
-        # Check for specific findings
-        port_findings = [f for f in result["findings"] if "port" in f.get("id", "")]
-        assert len(port_findings) > 0
+class TestParsers:
+    """Test class for individual parsers"""
 
-        # Verify finding structure
-        for finding in result["findings"]:
-            assert "id" in finding
-            assert "title" in finding
-            assert "description" in finding
-            assert "target" in finding
-            assert "severity" in finding
-            assert "timestamp" in finding
-
-    def test_ffuf_parser_with_sample_data(self, sample_data):
-        """Test FFuf parser with sample JSON data"""
-        if "ffuf" not in sample_data:
-            pytest.skip("FFuf sample data not available")
-
-        parser = FFufParser()
-        result = parser.parse_single_result(
-            sample_data["ffuf"],
-            "ffuf -w wordlist.txt -u http://example.com/FUZZ",
-            "test_agent_002",
+    @pytest.mark.parametrize(
+        "tool,command,stats_keys,id_marker",
+        [
+            (
+                "nmap",
+                "nmap -sS -p 22,80,443,8080 192.168.1.1",
+                ("total_hosts", "up_hosts", "open_ports"),
+                "port",
+            ),
+            (
+                "ffuf",
+                "ffuf -w wordlist.txt -u http://example.com/FUZZ",
+                ("total_requests", "status_codes", "target_url"),
+                "ffuf",
+            ),
+            (
+                "tshark",
+                "tshark -i eth0 -c 10 -T json",
+                ("packets_analyzed", "protocols_seen"),
+                None,
+            ),
+        ],
+    )
+    def test_parser_with_sample_data(
+        self, parsers, sample_data, tool, command, stats_keys, id_marker
+    ):
+        """Test each parser against its sample output"""
+        if tool not in sample_data:
+            pytest.skip(f"{tool} sample data not available")
+
+        result = parsers[tool].parse_single_result(
+            sample_data[tool], command, f"test_agent_{tool}"
         )
 
         # Verify structure
@@ -147,56 +138,42 @@ class TestParsers:
         assert len(result["findings"]) > 0
 
         # Verify statistics
-        stats = result["statistics"]
-        assert "total_requests" in stats
-        assert "status_codes" in stats
-        assert "target_url" in stats
+        for key in stats_keys:
+            assert key in result["statistics"]
 
-        # Check for specific findings
-        url_findings = [f for f in result["findings"] if "ffuf" in f.get("id", "")]
-        assert len(url_findings) > 0
+        # Check for tool specific findings
+        if id_marker:
+            assert any(id_marker in f.get("id", "") for f in result["findings"])
 
         # Verify finding structure
         for finding in result["findings"]:
-            assert "id" in finding
-            assert "title" in finding
-            assert "description" in finding
-            assert "target" in finding
-            assert "severity" in finding
-            assert "timestamp" in finding
-
-    def test_tshark_parser_with_sample_data(self, sample_data):
-        """Test Tshark parser with sample JSON data"""
-        if "tshark" not in sample_data:
-            pytest.skip("Tshark sample data not available")
-
-        parser = TsharkParser()
-        result = parser.parse_single_result(
-            sample_data["tshark"], "tshark -i eth0 -c 10 -T json", "test_agent_003"
+            _assert_finding_shape(finding)
+
+    def test_tshark_parser_with_ek_output(self, parsers):
+        """Test Tshark parser with newline-delimited ``-T ek`` output"""
+        ek_output = "\n".join(
+            [
+                '{"index":{"_index":"packets-2025-09-01","_type":"doc"}}',
+                '{"timestamp":"1756713600000","layers":{'
+                '"frame":{"frame_frame_number":"1","frame_frame_time_epoch":"1756713600.0"},'
+                '"ip":{"ip_ip_src":"192.168.1.10","ip_ip_dst":"192.168.1.1"},'
+                '"tcp":{"tcp_tcp_srcport":"51000","tcp_tcp_dstport":"443"}}}',
+                '{"index":{"_index":"packets-2025-09-01","_type":"doc"}}',
+                '{"timestamp":"1756713601000","layers":{'
+                '"frame_number":["2"],"frame_time_epoch":["1756713601.0"],'
+                '"arp_src_proto_ipv4":["192.168.1.1"],"arp_dst_proto_ipv4":["192.168.1.10"],'
+                '"arp_opcode":["2"]}}',
+            ]
         )
 
-        # Verify structure
-        assert "findings" in result
-        assert "statistics" in result
-        assert isinstance(result["findings"], list)
-        assert isinstance(result["statistics"], dict)
-
-        # Verify findings
-        assert len(result["findings"]) > 0
-
-        # Verify statistics
-        stats = result["statistics"]
-        assert "packets_analyzed" in stats or "total_packets" in stats
-        assert "protocols_seen" in stats or "protocols" in stats
+        result = parsers["tshark"].parse_single_result(
+            ek_output, "tshark -r capture.pcap -T ek", "test_agent_003"
+        )
 
-        # Verify finding structure
-        for finding in result["findings"]:
-            assert "id" in finding
-            assert "title" in finding
-            assert "description" in finding
-            assert "target" in finding
-            assert "severity" in finding
-            assert "timestamp" in finding
+        assert result["statistics"]["packets_analyzed"] == 2
+        assert result["statistics"]["protocols_seen"] == {"TCP": 1, "ARP": 1}
+        assert [f["id"] for f in result["findings"]] == ["tcp_1", "arp_2"]
+        assert result["findings"][0]["title"] == "TCP Traffic to HTTPS"
 
 
 class TestToolManager:
@@ -225,13 +202,17 @@ class TestToolManager:
         assert tshark_tool is not None
         assert hasattr(tshark_tool, "parse_results")
 
-    def test_tool_manager_parse_results(self, tool_manager, sample_data):
-        """Test that ToolManager can parse results for each tool"""
-        for tool_name, data in sample_data.items():
-            result = tool_manager.parse_results(
-                tool_name, data, f"{tool_name} test command", f"test_agent_{tool_name}"
-            )
+    def test_tool_variant_arguments_are_copies(self, tool_manager):
+        """Test that mutating a returned variant leaves the shared template intact"""
+        variant = tool_manager.get_tool_variant("nmap", "tcp_connect_scan")
+        variant["arguments"].append("--injected")
+
+        fresh = tool_manager.get_tool_variant("nmap", "tcp_connect_scan")
+        assert "--injected" not in fresh["arguments"]
 
+    def test_tool_manager_parse_results(self, parsed_results):
+        """Test that ToolManager can parse results for each tool"""
+        for result in parsed_results.values():
             # Verify basic structure
             assert result is not None
             assert "findings" in result
@@ -242,20 +223,16 @@ class TestToolManager:
 class TestReportGeneration:
     """Test class for report generation functionality"""
 
-    def test_basic_report_generation(self, tool_manager, sample_data):
+    def test_basic_report_generation(self, parsed_results):
         """Test basic report generation with sample data"""
-        if not sample_data:
+        if not parsed_results:
             pytest.skip("No sample data available")
 
         # Generate findings for each tool
         all_findings = []
         all_statistics = {}
 
-        for tool, data in sample_data.items():
-            result = tool_manager.parse_results(
-                tool, data, f"{tool} test command", f"test_agent_{tool}"
-            )
-
+        for tool, result in parsed_results.items():
             if result and "findings" in result and "statistics" in result:
                 all_findings.extend(result["findings"])
                 all_statistics[tool] = result["statistics"]
@@ -269,26 +246,22 @@ class TestReportGeneration:
                 "report_id": "test_report_001",
                 "name": "Test Security Assessment Report",
                 "created_at": datetime.now().isoformat(),
-                "total_jobs": len(sample_data),
+                "total_jobs": len(parsed_results),
             },
             "summary": {
                 "total_findings": len(all_findings),
-                "tools_used": list(sample_data.keys()),
-                "severity_distribution": {},
+                "tools_used": list(parsed_results),
+                # Count findings by severity
+                "severity_distribution": dict(
+                    Counter(f.get("severity", "unknown") for f in all_findings)
+                ),
             },
             "findings_by_tool": {},
             "all_findings": all_findings,
         }
 
-        # Count findings by severity
-        for finding in all_findings:
-            severity = finding.get("severity", "unknown")
-            report["summary"]["severity_distribution"][severity] = (
-                report["summary"]["severity_distribution"].get(severity, 0) + 1
-            )
-
         # Group findings by tool
-        for tool in sample_data.keys():
+        for tool in parsed_results:
             tool_findings = [f for f in all_findings if tool in f.get("id", "")]
             report["findings_by_tool"][tool] = {
                 "tool_name": tool.title(),
@@ -308,108 +281,58 @@ class TestReportGeneration:
             assert "findings" in tool_data
             assert "statistics" in tool_data
 
-    def test_finding_severity_levels(self, tool_manager, sample_data):
+    def test_finding_severity_levels(self, parsed_results):
         """Test that findings have appropriate severity levels"""
-        if not sample_data:
+        if not parsed_results:
             pytest.skip("No sample data available")
 
         severity_levels = set()
 
-        for tool, data in sample_data.items():
-            result = tool_manager.parse_results(
-                tool, data, f"{tool} test command", f"test_agent_{tool}"
-            )
-
+        for result in parsed_results.values():
             if result and "findings" in result:
                 for finding in result["findings"]:
                     severity = finding.get("severity", "unknown")
                     severity_levels.add(severity)
 
                     # Verify severity is one of the expected values
-                    assert severity in ["low", "medium", "high", "critical", "info"]
+                    assert severity in _VALID_SEVERITIES
 
         # Should have multiple severity levels
         assert len(severity_levels) > 1
 
-    def test_agent_id_in_findings(self, tool_manager, sample_data):
+    def test_agent_id_in_findings(self, parsed_results):
         """Test that agent_id is correctly included in findings"""
-        if not sample_data:
+        if not parsed_results:
             pytest.skip("No sample data available")
 
-        for tool, data in sample_data.items():
+        for tool, result in parsed_results.items():
             test_agent_id = f"test_agent_{tool}"
-            result = tool_manager.parse_results(
-                tool, data, f"{tool} test command", test_agent_id
-            )
-
             if result and "findings" in result:
                 for finding in result["findings"]:
                     # Verify agent_id is present and correct
                     assert "agent_id" in finding
                     assert finding["agent_id"] == test_agent_id
 
-    def test_finding_targets(self, tool_manager, sample_data):
+    def test_finding_targets(self, parsed_results):
         """Test that findings have appropriate targets"""
-        if not sample_data:
+        if not parsed_results:
             pytest.skip("No sample data available")
 
-        for tool, data in sample_data.items():
-            result = tool_manager.parse_results(
-                tool, data, f"{tool} test command", f"test_agent_{tool}"
-            )
-
+        for tool, result in parsed_results.items():
             if result and "findings" in result:
                 for finding in result["findings"]:
                     target = finding.get("target", "")
                     assert target != ""
 
                     # Verify target format based on tool
-                    if tool == "nmap":
-                        # Nmap targets should contain IP addresses or hostnames
-                        # More flexible check for nmap targets
-                        assert (
-                            any(
-                                ip in target
-                                for ip in [
-                                    "192.168.1.1",
-                                    "router.local",
-                                    "internetbox.home",
-                                ]
-                            )
-                            or ":" in target
-                        )
-                    elif tool == "ffuf":
-                        # FFuf targets should be URLs
-                        assert (
-                            "http://" in target
-                            or "https://" in target
-                            or "example.com" in target
-                        )
-                    elif tool == "tshark":
-                        # Tshark targets should contain protocol information or IP addresses
-                        assert (
-                            any(
-                                proto in target.lower()
-                                for proto in ["arp", "tcp", "udp", "eth"]
-                            )
-                            or "packet" in target.lower()
-                            or "→" in target
-                            or any(
-                                ip in target
-                                for ip in ["172.21", "192.168", "10.0", "127.0"]
-                            )
-                        )
-
-    def test_statistics_consistency(self, tool_manager, sample_data):
+                    assert _TARGET_PATTERNS[tool].search(target), target
+
+    def test_statistics_consistency(self, parsed_results):
         """Test that statistics are consistent across different tools"""
-        if not sample_data:
+        if not parsed_results:
             pytest.skip("No sample data available")
 
-        for tool, data in sample_data.items():
-            result = tool_manager.parse_results(
-                tool, data, f"{tool} test command", f"test_agent_{tool}"
-            )
-
+        for result in parsed_results.values():
             if result and "statistics" in result:
                 stats = result["statistics"]
 
@@ -427,33 +350,34 @@ class TestReportGeneration:
 class TestErrorHandling:
     """Test class for error handling scenarios"""
 
-    def test_parsers_with_invalid_data(self):
+    def test_parsers_with_invalid_data(self, parsers):
         """Test that parsers handle invalid data gracefully"""
         invalid_data = "This is not valid XML or JSON data"
 
-        # Test Nmap parser with invalid data
-        nmap_parser = NmapParser()
-        result = nmap_parser.parse_single_result(
-            invalid_data, "nmap invalid", "test_agent_001"
-        )
-        assert "findings" in result
-        assert "statistics" in result
+        for tool, parser in parsers.items():
+            result = parser.parse_single_result(
+                invalid_data, f"{tool} invalid", f"test_agent_{tool}"
+            )
+            assert "findings" in result
+            assert "statistics" in result
 
-        # Test FFuf parser with invalid data
-        ffuf_parser = FFufParser()
-        result = ffuf_parser.parse_single_result(
-            invalid_data, "ffuf invalid", "test_agent_002"
+    def test_tshark_parser_skips_malformed_ek_lines(self, parsers):
+        """Test that ek lines with malformed layers are skipped, not raised"""
+        ek_output = "\n".join(
+            [
+                '{"layers":"x"}',
+                '{"layers":null}',
+                '{"layers":{"frame_number":["1"],"frame_time_epoch":["1756713600.0"],'
+                '"ip_src":["10.0.0.1"],"ip_dst":["10.0.0.2"],"icmp_type":["8"]}}',
+            ]
         )
-        assert "findings" in result
-        assert "statistics" in result
 
-        # Test Tshark parser with invalid data
-        tshark_parser = TsharkParser()
-        result = tshark_parser.parse_single_result(
-            invalid_data, "tshark invalid", "test_agent_003"
+        result = parsers["tshark"].parse_single_result(
+            ek_output, "tshark -r capture.pcap -T ek", "test_agent_003"
         )
-        assert "findings" in result
-        assert "statistics" in result
+
+        assert result["statistics"]["packets_analyzed"] == 1
+        assert [f["id"] for f in result["findings"]] == ["icmp_1"]
 
     def test_tool_manager_with_unknown_tool(self, tool_manager):
         """Test ToolManager behavior with unknown tools"""
@@ -1,209 +1,146 @@
+import itertools
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import partial
+from typing import Optional
 
-from fastapi.testclient import TestClient
+import pytest
 
 import app.api.v1.reports as reports_module
-from app.core.database import database, get_db
-from app.main import app
+from app.core.exceptions import DeleteError
+from app.services.reports import ReportsService
+from tests.helpers import NOW, json_body, make_service
 
 
-class FakeReportsService:
-    async def get_reports(self):
-        class Obj:
-            id = uuid.uuid4()
-            name = "report-1"
-            description = "test report"
-            results = {"summary": "ok"}
-            created_at = datetime.utcnow()
+_UUID_SEQ = itertools.count(1)
 
-        return [Obj()]
 
+def _next_uuid():
+    """Distinct, deterministic UUIDs without uuid4's entropy read"""
+    return uuid.UUID(int=next(_UUID_SEQ))
 
-async def _override_db():
-    yield None
 
+_CREATE_PAYLOAD = {
+    "name": "report-x",
+    "description": "desc",
+    "jobs_ids": ["00000000-0000-0000-0000-000000000001"],
+}
+_UPDATE_PAYLOAD = {"name": "report-updated"}
+# Missing required fields (name, jobs_ids)
+_INVALID_PAYLOAD = {"description": "desc"}
 
-def test_get_reports_ok(monkeypatch):
-    monkeypatch.setattr(
-        reports_module, "ReportsService", lambda db: FakeReportsService()
-    )
-    app.dependency_overrides[get_db] = _override_db
-    try:
-        # Disable real DB side-effects from app lifespan
-        monkeypatch.setattr(database, "connect", lambda: None)
-        monkeypatch.setattr(database, "create_tables", lambda: None)
-        monkeypatch.setattr(database, "disconnect", lambda: None)
-
-        client = TestClient(app)
-        r = client.get("/api/v1/reports")
-        assert r.status_code == 200
-        body = r.json()
-        assert isinstance(body.get("data"), list)
-        first = body["data"][0]
-        assert first.get("type") == "reports"
-        assert first.get("attributes", {}).get("name") == "report-1"
-        assert first.get("attributes", {}).get("results", {}).get("summary") == "ok"
-    finally:
-        app.dependency_overrides.clear()
-
-
-def test_create_report_ok(monkeypatch):
-    class FakeCreateService:
-        async def create_report(self, report_create):
-            class Obj:
-                id = uuid.uuid4()
-                name = report_create.name
-                description = report_create.description
-                results = {"summary": "ok"}
-                created_at = datetime.utcnow()
-
-            return Obj()
-
-    monkeypatch.setattr(
-        reports_module, "ReportsService", lambda db: FakeCreateService()
-    )
-    app.dependency_overrides[get_db] = _override_db
-    try:
-        monkeypatch.setattr(database, "connect", lambda: None)
-        monkeypatch.setattr(database, "create_tables", lambda: None)
-        monkeypatch.setattr(database, "disconnect", lambda: None)
-
-        client = TestClient(app)
-        payload = {
-            "name": "report-x",
-            "description": "desc",
-            "jobs_ids": [str(uuid.uuid4())],
-        }
-        r = client.post("/api/v1/reports", json=payload)
-        assert r.status_code == 200
-        body = r.json()
-        assert body.get("data", {}).get("type") == "reports"
-        assert body["data"]["attributes"]["name"] == "report-x"
-        assert body["data"]["attributes"]["results"]["summary"] == "ok"
-    finally:
-        app.dependency_overrides.clear()
-
-
-def test_update_report_ok(monkeypatch):
-    report_id = str(uuid.uuid4())
-
-    class FakeUpdateService:
-        async def update_report(self, _report_id, report_update):
-            class Obj:
-                id = uuid.UUID(report_id)
-                name = report_update.name or "report-1"
-                description = report_update.description or "desc"
-                results = {"summary": "ok"}
-                created_at = datetime.utcnow()
-
-            return Obj()
-
-    monkeypatch.setattr(
-        reports_module, "ReportsService", lambda db: FakeUpdateService()
-    )
-    app.dependency_overrides[get_db] = _override_db
-    try:
-        monkeypatch.setattr(database, "connect", lambda: None)
-        monkeypatch.setattr(database, "create_tables", lambda: None)
-        monkeypatch.setattr(database, "disconnect", lambda: None)
-
-        client = TestClient(app)
-        payload = {"name": "report-updated"}
-        r = client.patch(f"/api/v1/reports/{report_id}", json=payload)
-        assert r.status_code == 200
-        body = r.json()
-        assert body.get("data", {}).get("type") == "reports"
-        assert body["data"]["id"] == report_id
-        assert body["data"]["attributes"]["name"] == "report-updated"
-    finally:
-        app.dependency_overrides.clear()
-
-
-def test_create_report_invalid_payload(monkeypatch):
-    class FakeService:
-        async def create_report(self, report_create):
-            raise AssertionError("Should not be called due to validation error")
-
-    monkeypatch.setattr(reports_module, "ReportsService", lambda db: FakeService())
-    app.dependency_overrides[get_db] = _override_db
-    try:
-        monkeypatch.setattr(database, "connect", lambda: None)
-        monkeypatch.setattr(database, "create_tables", lambda: None)
-        monkeypatch.setattr(database, "disconnect", lambda: None)
-
-        client = TestClient(app)
-        # Missing required fields (name, jobs_ids)
-        r = client.post("/api/v1/reports", json={"description": "desc"})
-        assert r.status_code in (400, 422)
-        assert "errors" in r.json()
-    finally:
-        app.dependency_overrides.clear()
-
-
-def test_delete_report_ok_and_not_found(monkeypatch):
-    report_id_ok = str(uuid.uuid4())
-    report_id_missing = str(uuid.uuid4())
-
-    class FakeDeleteService:
-        async def delete_report(self, report_id: str):
-            if report_id == report_id_missing:
-                from app.core.exceptions import DeleteError
-
-                raise DeleteError("not found")
-            return None
-
-    monkeypatch.setattr(
-        reports_module, "ReportsService", lambda db: FakeDeleteService()
-    )
-    app.dependency_overrides[get_db] = _override_db
-    try:
-        monkeypatch.setattr(database, "connect", lambda: None)
-        monkeypatch.setattr(database, "create_tables", lambda: None)
-        monkeypatch.setattr(database, "disconnect", lambda: None)
-
-        client = TestClient(app)
-        # OK case
-        r_ok = client.delete(f"/api/v1/reports/{report_id_ok}")
-        assert r_ok.status_code == 200
-        assert (
-            r_ok.json().get("data", {}).get("attributes", {}).get("message")
-            == "Report deleted"
-        )
 
-        # Not found case
-        r_nf = client.delete(f"/api/v1/reports/{report_id_missing}")
-        assert r_nf.status_code == 404
-        assert "errors" in r_nf.json()
-    finally:
-        app.dependency_overrides.clear()
+@dataclass
+class FakeReport:
+    id: uuid.UUID = field(default_factory=_next_uuid)
+    name: str = "report-1"
+    description: Optional[str] = "test report"
+    results: dict = field(default_factory=lambda: {"summary": "ok"})
+    created_at: datetime = NOW
+
+
+_service = partial(make_service, ReportsService)
+
 
+@pytest.fixture
+def use_service(monkeypatch):
+    """Serve the reports routes from the given service stand-in"""
 
-def test_reports_datetime_fields_are_iso(monkeypatch):
-    class FakeReportsServiceISO:
-        async def get_reports(self):
-            class Obj:
-                id = uuid.uuid4()
-                name = "report-iso"
-                description = "desc"
-                results = {"summary": "ok"}
-                created_at = datetime.utcnow()
+    def _use(service):
+        monkeypatch.setattr(reports_module, "ReportsService", lambda db: service)
 
-            return [Obj()]
+    return _use
 
-    monkeypatch.setattr(
-        reports_module, "ReportsService", lambda db: FakeReportsServiceISO()
+
+@pytest.mark.anyio
+async def test_get_reports_ok(use_service, async_client):
+    use_service(_service(get_reports=[FakeReport()]))
+    r = await async_client.get("/api/v1/reports")
+    assert r.status_code == 200
+    body = json_body(r)
+    assert isinstance(body.get("data"), list)
+    first = body["data"][0]
+    assert first.get("type") == "reports"
+    assert first.get("attributes", {}).get("name") == "report-1"
+    assert first.get("attributes", {}).get("results", {}).get("summary") == "ok"
+
+
+@pytest.mark.anyio
+async def test_create_report_ok(use_service, async_client):
+    use_service(
+        _service(
+            create_report=lambda report_create: FakeReport(
+                name=report_create.name, description=report_create.description
+            )
+        )
+    )
+    r = await async_client.post("/api/v1/reports", json=_CREATE_PAYLOAD)
+    assert r.status_code == 200
+    body = json_body(r)
+    assert body.get("data", {}).get("type") == "reports"
+    assert body["data"]["attributes"]["name"] == "report-x"
+    assert body["data"]["attributes"]["results"]["summary"] == "ok"
+
+
+@pytest.mark.anyio
+async def test_update_report_ok(use_service, async_client):
+    report_id = str(_next_uuid())
+
+    use_service(
+        _service(
+            update_report=lambda _report_id, report_update: FakeReport(
+                id=uuid.UUID(report_id),
+                name=report_update.name or "report-1",
+                description=report_update.description or "desc",
+            )
+        )
+    )
+    r = await async_client.patch(f"/api/v1/reports/{report_id}", json=_UPDATE_PAYLOAD)
+    assert r.status_code == 200
+    body = json_body(r)
+    assert body.get("data", {}).get("type") == "reports"
+    assert body["data"]["id"] == report_id
+    assert body["data"]["attributes"]["name"] == "report-updated"
+
+
+@pytest.mark.anyio
+async def test_create_report_invalid_payload(use_service, async_client):
+    service = _service()
+    use_service(service)
+
+    r = await async_client.post("/api/v1/reports", json=_INVALID_PAYLOAD)
+    assert r.status_code in (400, 422)
+    assert "errors" in json_body(r)
+    service.create_report.assert_not_awaited()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "side_effect,status_code",
+    [(None, 200), (DeleteError("not found"), 404)],
+    ids=["ok", "not_found"],
+)
+async def test_delete_report(use_service, async_client, side_effect, status_code):
+    service = _service()
+    service.delete_report.side_effect = side_effect
+    use_service(service)
+
+    r = await async_client.delete(f"/api/v1/reports/{_next_uuid()}")
+    assert r.status_code == status_code
+    body = json_body(r)
+    if status_code == 200:
+        assert body["data"]["attributes"]["message"] == "Report deleted"
+    else:
+        assert "errors" in body
+
+
+@pytest.mark.anyio
+async def test_reports_datetime_fields_are_iso(use_service, async_client):
+    use_service(
+        _service(get_reports=[FakeReport(name="report-iso", description="desc")])
     )
-    app.dependency_overrides[get_db] = _override_db
-    try:
-        monkeypatch.setattr(database, "connect", lambda: None)
-        monkeypatch.setattr(database, "create_tables", lambda: None)
-        monkeypatch.setattr(database, "disconnect", lambda: None)
-
-        client = TestClient(app)
-        r = client.get("/api/v1/reports")
-        assert r.status_code == 200
-        attrs = r.json()["data"][0]["attributes"]
-        assert isinstance(attrs["created_at"], str) and "T" in attrs["created_at"]
-    finally:
-        app.dependency_overrides.clear()
+    r = await async_client.get("/api/v1/reports")
+    assert r.status_code == 200
+    attrs = json_body(r)["data"][0]["attributes"]
+    assert attrs["created_at"] == NOW.isoformat()
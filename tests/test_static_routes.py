@@ -1,28 +1,29 @@
-from fastapi.testclient import TestClient
+import pytest
 
-from app.main import app
+from tests.helpers import json_body
 
-client = TestClient(app)
 
-
-def test_root_ok():
-    r = client.get("/")
+@pytest.mark.anyio
+async def test_root_ok(async_client):
+    r = await async_client.get("/")
     assert r.status_code == 200
-    body = r.json()
+    body = json_body(r)
     assert set(["service", "environment", "version", "docs"]).issubset(body.keys())
 
 
-def test_health_ok():
-    r = client.get("/api/v1/health")
+@pytest.mark.anyio
+async def test_health_ok(async_client):
+    r = await async_client.get("/api/v1/health")
     assert r.status_code == 200
-    assert r.json()["status"] == "ok"
+    assert json_body(r)["status"] == "ok"
 
 
-def test_tools_ok_jsonapi_shape():
-    r = client.get("/api/v1/tools")
+@pytest.mark.anyio
+async def test_tools_ok_jsonapi_shape(async_client):
+    r = await async_client.get("/api/v1/tools")
     assert r.status_code == 200
 
-    payload = r.json()
+    payload = json_body(r)
     assert "data" in payload
     assert isinstance(payload["data"], list)
     assert len(payload["data"]) > 0